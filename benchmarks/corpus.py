@@ -0,0 +1,36 @@
+# benchmarks/corpus.py
+
+import os
+from bs4 import BeautifulSoup
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+RESUMES_DIR = os.path.join(FIXTURES_DIR, "resumes")
+JOBS_DIR = os.path.join(FIXTURES_DIR, "jobs")
+
+
+def load_resume_texts() -> dict:
+    """Returns {name: text} for every fixture resume."""
+    resumes = {}
+    for filename in sorted(os.listdir(RESUMES_DIR)):
+        if filename.endswith(".txt"):
+            with open(os.path.join(RESUMES_DIR, filename), encoding="utf-8") as f:
+                resumes[os.path.splitext(filename)[0]] = f.read()
+    return resumes
+
+
+def load_job_pages() -> dict:
+    """Returns {name: raw html} for every saved job page."""
+    pages = {}
+    for filename in sorted(os.listdir(JOBS_DIR)):
+        if filename.endswith(".html"):
+            with open(os.path.join(JOBS_DIR, filename), "rb") as f:
+                pages[os.path.splitext(filename)[0]] = f.read()
+    return pages
+
+
+def load_job_descriptions() -> dict:
+    """Returns {name: text} for every saved job page, cleaned the same way as the Web Scraper tool."""
+    return {
+        name: ' '.join(BeautifulSoup(html, 'html.parser').get_text().split())
+        for name, html in load_job_pages().items()
+    }
@@ -0,0 +1,92 @@
+# benchmarks/embedding_backends.py
+#
+# Compares embedding backends on the fixture corpus:
+#   python -m benchmarks.embedding_backends --backends torch onnx onnx-int8 --threads 4
+
+import os
+import sys
+import time
+import json
+import argparse
+import numpy as np
+
+# Ensure absolute imports work
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.services.embedding_backend import BACKENDS, get_embedding_backend
+from benchmarks.corpus import load_resume_texts, load_job_descriptions
+
+
+def benchmark_backend(name: str, threads: int, resumes: dict, jobs: dict, repeats: int) -> dict:
+    """Measures load time, batch throughput, single-pair latency and the resume x JD score matrix."""
+    start = time.perf_counter()
+    backend = get_embedding_backend(name, threads)
+    load_seconds = time.perf_counter() - start
+
+    texts = list(resumes.values()) + list(jobs.values())
+    backend.encode(texts)  # Warm-up
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        backend.encode(texts)
+    batch_seconds = time.perf_counter() - start
+
+    # The Embedding Matcher tool scores one resume against one JD per call
+    pairs = [(r, j) for r in resumes.values() for j in jobs.values()]
+    start = time.perf_counter()
+    for resume_text, job_text in pairs:
+        backend.similarity(resume_text, job_text)
+    pair_seconds = time.perf_counter() - start
+
+    resume_embeddings = backend.encode(list(resumes.values()))
+    job_embeddings = backend.encode(list(jobs.values()))
+    scores = resume_embeddings @ job_embeddings.T * 100
+
+    return {
+        "backend": name,
+        "threads": threads,
+        "load_seconds": round(load_seconds, 3),
+        "texts_per_second": round(len(texts) * repeats / batch_seconds, 1),
+        "pair_latency_ms": round(pair_seconds / len(pairs) * 1000, 2),
+        "scores": scores,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark embedding backends on the fixture corpus.")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--threads", type=int, default=0, help="Intra-op threads, 0 for the runtime default.")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--output", help="Optional path to write the results as JSON.")
+    args = parser.parse_args()
+
+    resumes = load_resume_texts()
+    jobs = load_job_descriptions()
+    print(f"Corpus: {len(resumes)} resumes, {len(jobs)} job descriptions")
+
+    # Score drift is measured against the full-precision PyTorch path
+    names = ["torch"] + [b for b in args.backends if b != "torch"]
+    results = [benchmark_backend(name, args.threads, resumes, jobs, args.repeats) for name in names]
+    reference = results[0]["scores"]
+
+    print(f"\n{'backend':<10} {'load s':>8} {'texts/s':>9} {'pair ms':>8} {'mean drift':>11} {'max drift':>10} {'top-1 agree':>12}")
+    for result in results:
+        drift = np.abs(result["scores"] - reference)
+        agreement = float(np.mean(result["scores"].argmax(axis=1) == reference.argmax(axis=1)))
+        result.update({
+            "mean_score_drift": round(float(drift.mean()), 4),
+            "max_score_drift": round(float(drift.max()), 4),
+            "top1_agreement": round(agreement, 3),
+        })
+        print(f"{result['backend']:<10} {result['load_seconds']:>8} {result['texts_per_second']:>9} "
+              f"{result['pair_latency_ms']:>8} {result['mean_score_drift']:>11} {result['max_score_drift']:>10} "
+              f"{result['top1_agreement']:>12}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump([{k: v for k, v in r.items() if k != "scores"} for r in results], f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,294 @@
+# benchmarks/pipeline.py
+#
+# Offline end-to-end benchmark of the recruitment workflow. Saved job pages, the
+# OpenAI API and the Google Calendar API are replaced by local replay servers.
+#
+#   python -m benchmarks.pipeline --runs 3 --llm-latency-ms 800
+#   python -m benchmarks.pipeline --save-baseline
+#   python -m benchmarks.pipeline --multi-requisition  # batch path, one call per pass
+#   python -m benchmarks.pipeline --record        # record real LLM responses for replay
+
+import os
+import sys
+import glob
+import json
+import math
+import time
+import shutil
+import argparse
+import resource
+from collections import defaultdict
+
+# Ensure absolute imports work
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import fitz
+from benchmarks.corpus import FIXTURES_DIR, load_resume_texts, load_job_pages
+from benchmarks.stub_servers import StubServer, JobPageHandler, CalendarHandler, LLMHandler
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(BENCHMARKS_DIR, "output")
+BASELINE_PATH = os.path.join(BENCHMARKS_DIR, "baseline.json")
+MULTI_REQUISITION_BASELINE_PATH = os.path.join(BENCHMARKS_DIR, "baseline_multi_requisition.json")
+SCRIPT_PATH = os.path.join(FIXTURES_DIR, "llm_script.json")
+RECORDINGS_PATH = os.path.join(FIXTURES_DIR, "llm_recordings.json")
+SAMPLE_PDFS = os.path.join(BENCHMARKS_DIR, "..", "temp", "*.pdf")
+
+
+def prepare_resume_pdfs(output_dir: str) -> dict:
+    """Renders the text fixtures to PDFs (plus the sample PDFs in temp/) at stable paths."""
+    resumes_dir = os.path.join(output_dir, "resumes")
+    os.makedirs(resumes_dir, exist_ok=True)
+
+    paths = {}
+    for name, text in load_resume_texts().items():
+        path = os.path.join(resumes_dir, f"{name}.pdf")
+        with fitz.open() as doc:
+            page = doc.new_page()
+            page.insert_textbox(fitz.Rect(50, 50, 550, 800), text, fontsize=10)
+            doc.save(path)
+        paths[name] = path
+
+    for sample in sorted(glob.glob(SAMPLE_PDFS)):
+        name = os.path.splitext(os.path.basename(sample))[0].strip().replace(" ", "_")
+        path = os.path.join(resumes_dir, f"{name}.pdf")
+        shutil.copyfile(sample, path)
+        paths[name] = path
+    return paths
+
+
+def start_servers(args) -> dict:
+    """Starts the replay servers and points the app's environment at them."""
+    with open(SCRIPT_PATH) as f:
+        script = json.load(f)
+    with open(RECORDINGS_PATH) as f:
+        recordings = json.load(f)
+
+    record_upstream = None
+    if args.record:
+        record_upstream = os.getenv("OPENAI_API_BASE") or "https://api.openai.com/v1"
+
+    servers = {
+        "jobs": StubServer(JobPageHandler, args.http_latency_ms, pages=load_job_pages()).start(),
+        "calendar": StubServer(CalendarHandler, args.calendar_latency_ms, events=[]).start(),
+        "llm": StubServer(
+            LLMHandler, args.llm_latency_ms,
+            script=script,
+            recordings=recordings,
+            record_upstream=record_upstream,
+            # Prompts name the rendered resumes by absolute path; mask it so recordings match on any machine
+            masked_paths={OUTPUT_DIR: "<benchmark-output>"},
+            stats={"recorded": 0, "scripted": 0, "proxied": 0}
+        ).start(),
+    }
+
+    # Must be set before src modules (and config.settings) are imported
+    if not args.record:
+        os.environ["OPENAI_API_KEY"] = "stub-key"
+    os.environ["OPENAI_API_BASE"] = f"{servers['llm'].url}/v1"
+    os.environ["OPENAI_BASE_URL"] = f"{servers['llm'].url}/v1"
+    os.environ.setdefault("OPENAI_MODEL_NAME", "gpt-4o-mini")
+    os.environ["GOOGLE_CALENDAR_API_ENDPOINT"] = f"{servers['calendar'].url}/calendar/v3/"
+    # Checkpoints would turn repeated runs into cache restores, so they are opt-in here
+    os.environ["WORKFLOW_CHECKPOINTS"] = "1" if args.checkpoints else "0"
+    os.environ["CHECKPOINT_DIR"] = os.path.join(OUTPUT_DIR, "checkpoints")
+    if args.profile:
+        os.environ["HIRING_AGENT_PROFILE"] = "1"
+        os.environ["PROFILE_OUTPUT_DIR"] = os.path.join(OUTPUT_DIR, "profiles")
+    return servers
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def hit_rate(hits: int, total: int) -> float:
+    return round(hits / total, 3) if total else 0.0
+
+
+def summarize(timings: list) -> dict:
+    return {
+        "count": len(timings),
+        "p50_s": round(percentile(timings, 50), 4),
+        "p95_s": round(percentile(timings, 95), 4),
+    }
+
+
+def run_benchmark(args, servers: dict) -> dict:
+    """Runs the resume x job corpus through the workflow (per pair or as one batch) and collects metrics."""
+    from src.resume_processor import run_recruitment_workflow, run_multi_requisition_screening, checkpoint_store
+    from src.agents.agents import job_page_cache_stats
+    from src.services.embedding_backend import load_embedding_backend
+
+    resume_paths = prepare_resume_pdfs(OUTPUT_DIR)
+    job_urls = {name: f"{servers['jobs'].url}/jobs/{name}.html" for name in load_job_pages()}
+    pairs = [(r, j) for r in resume_paths for j in job_urls][:args.max_pairs or None]
+
+    stage_timings = defaultdict(list)
+    run_timings = []
+    failures = 0
+
+    def record_stage(stage_name: str, seconds: float):
+        stage_timings[stage_name].append(seconds)
+
+    started = time.perf_counter()
+    for run in range(args.runs):
+        if args.multi_requisition:
+            # One batch call screens the whole pool against every job page
+            print(f"[run {run + 1}/{args.runs}] {len(resume_paths)} resumes x {len(job_urls)} jobs")
+            run_started = time.perf_counter()
+            try:
+                run_multi_requisition_screening(
+                    list(resume_paths.values()), list(job_urls.values()), stage_callback=record_stage
+                )
+            except Exception as e:
+                failures += 1
+                print(f"Run failed: {e}")
+                continue
+            run_timings.append(time.perf_counter() - run_started)
+            continue
+
+        for resume_name, job_name in pairs:
+            print(f"[run {run + 1}/{args.runs}] {resume_name} x {job_name}")
+            run_started = time.perf_counter()
+            try:
+                run_recruitment_workflow(
+                    resume_file_path=resume_paths[resume_name],
+                    job_url=job_urls[job_name],
+                    preferred_time=args.preferred_time if args.schedule else None,
+                    candidate_email=f"{resume_name}@example.com" if args.schedule else None,
+                    stage_callback=record_stage
+                )
+            except Exception as e:
+                failures += 1
+                print(f"Run failed: {e}")
+                continue
+            run_timings.append(time.perf_counter() - run_started)
+    elapsed = time.perf_counter() - started
+
+    backend_cache = load_embedding_backend.cache_info()
+    llm_stats = servers["llm"].handler_class.stats
+    llm_total = sum(llm_stats.values())
+
+    return {
+        "runs": len(run_timings),
+        "failures": failures,
+        "stages": {name: summarize(timings) for name, timings in stage_timings.items()},
+        "workflow": summarize(run_timings),
+        "throughput_per_minute": round(len(run_timings) / elapsed * 60, 2) if elapsed else 0.0,
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "cache_hit_rates": {
+            "job_page_scrape": hit_rate(job_page_cache_stats["hits"], job_page_cache_stats["hits"] + job_page_cache_stats["misses"]),
+            "embedding_backend": hit_rate(backend_cache.hits, backend_cache.hits + backend_cache.misses),
+            "llm_replay": hit_rate(llm_stats["recorded"], llm_total),
+            "stage_checkpoints": hit_rate(
+                checkpoint_store.stats["hits"], checkpoint_store.stats["hits"] + checkpoint_store.stats["misses"]
+            ),
+        },
+        "llm_requests": dict(llm_stats),
+        "calendar_events": len(servers["calendar"].handler_class.events),
+    }
+
+
+def find_regressions(report: dict, baseline: dict, tolerance: float) -> list:
+    """Lists every metric that got worse than the baseline by more than the tolerance."""
+    regressions = []
+
+    def check_slower(label, current, previous):
+        if previous and current > previous * (1 + tolerance):
+            regressions.append(f"{label}: {current} vs baseline {previous}")
+
+    for name, stats in report["stages"].items():
+        previous = baseline.get("stages", {}).get(name, {})
+        check_slower(f"{name} p50_s", stats["p50_s"], previous.get("p50_s"))
+        check_slower(f"{name} p95_s", stats["p95_s"], previous.get("p95_s"))
+    check_slower("workflow p50_s", report["workflow"]["p50_s"], baseline.get("workflow", {}).get("p50_s"))
+    check_slower("workflow p95_s", report["workflow"]["p95_s"], baseline.get("workflow", {}).get("p95_s"))
+    check_slower("peak_rss_mb", report["peak_rss_mb"], baseline.get("peak_rss_mb"))
+
+    previous = baseline.get("throughput_per_minute")
+    if previous and report["throughput_per_minute"] < previous * (1 - tolerance):
+        regressions.append(f"throughput_per_minute: {report['throughput_per_minute']} vs baseline {previous}")
+
+    for name, rate in report["cache_hit_rates"].items():
+        previous = baseline.get("cache_hit_rates", {}).get(name)
+        if previous is not None and rate < previous - tolerance:
+            regressions.append(f"{name} cache hit rate: {rate} vs baseline {previous}")
+    return regressions
+
+
+def print_report(report: dict):
+    print(f"\n--- Pipeline benchmark: {report['runs']} runs, {report['failures']} failures ---")
+    print(f"{'stage':<24} {'count':>6} {'p50 s':>9} {'p95 s':>9}")
+    for name, stats in list(report["stages"].items()) + [("Workflow (total)", report["workflow"])]:
+        print(f"{name:<24} {stats['count']:>6} {stats['p50_s']:>9} {stats['p95_s']:>9}")
+    print(f"Throughput: {report['throughput_per_minute']} runs/min")
+    print(f"Peak RSS: {report['peak_rss_mb']} MB")
+    for name, rate in report["cache_hit_rates"].items():
+        print(f"Cache hit rate ({name}): {rate:.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay-based benchmark of the recruitment workflow.")
+    parser.add_argument("--runs", type=int, default=1, help="Passes over the resume x job corpus.")
+    parser.add_argument("--max-pairs", type=int, default=0, help="Limit resume x job pairs per pass (0 = all).")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--http-latency-ms", type=float, default=0.0)
+    parser.add_argument("--calendar-latency-ms", type=float, default=0.0)
+    parser.add_argument("--schedule", action="store_true", help="Include the interview scheduling stage.")
+    parser.add_argument("--multi-requisition", action="store_true",
+                        help="Benchmark the batch path that screens the whole pool against every job at once.")
+    parser.add_argument("--preferred-time", default="2025-08-12 03:00 PM")
+    parser.add_argument("--profile", action="store_true",
+                        help="Write a flamegraph and allocation report per run (adds overhead to the timings).")
+    parser.add_argument("--checkpoints", action="store_true", help="Keep stage checkpoints enabled between runs.")
+    parser.add_argument("--record", action="store_true", help="Forward unrecorded LLM calls upstream and save them.")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown before flagging.")
+    args = parser.parse_args()
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    servers = start_servers(args)
+    try:
+        report = run_benchmark(args, servers)
+    finally:
+        if args.record:
+            with open(RECORDINGS_PATH, "w") as f:
+                json.dump(servers["llm"].handler_class.recordings, f, indent=2)
+        for server in servers.values():
+            server.stop()
+
+    print_report(report)
+    with open(os.path.join(OUTPUT_DIR, "report.json"), "w") as f:
+        json.dump(report, f, indent=2)
+
+    baseline_path = MULTI_REQUISITION_BASELINE_PATH if args.multi_requisition else BASELINE_PATH
+    if args.save_baseline:
+        with open(baseline_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {baseline_path}")
+        return
+
+    if not os.path.exists(baseline_path):
+        print("No baseline found; run with --save-baseline to create one.")
+        return
+
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    regressions = find_regressions(report, baseline, args.tolerance)
+    if regressions:
+        print("\n⚠ Regressions against baseline:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        sys.exit(1)
+    print("\nNo regressions against baseline.")
+
+
+if __name__ == '__main__':
+    main()
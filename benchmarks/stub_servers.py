@@ -0,0 +1,331 @@
+# benchmarks/stub_servers.py
+#
+# Local HTTP servers that stand in for the job boards, the OpenAI API and the
+# Google Calendar API during benchmark runs. Each replays fixtures after a
+# configurable delay so runs are repeatable and fully offline.
+
+import re
+import ast
+import json
+import time
+import hashlib
+import threading
+import itertools
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+
+class StubServer:
+    """Runs a request handler on a background thread bound to a free local port."""
+
+    def __init__(self, handler_class, latency_ms: float = 0.0, **handler_state):
+        # Handler classes read their state from class attributes, so give each server its own subclass
+        self.handler_class = type(handler_class.__name__, (handler_class,), dict(handler_state, latency_ms=latency_ms))
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.handler_class)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Shared helpers: simulated latency, JSON bodies and quiet logging."""
+
+    latency_ms = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def simulate_latency(self):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def send_body(self, body: bytes, content_type: str, status: int = 200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, payload: dict, status: int = 200):
+        self.send_body(json.dumps(payload).encode("utf-8"), "application/json", status)
+
+
+# --- Saved job pages ---
+
+class JobPageHandler(FixtureHandler):
+    """Serves saved job pages at /jobs/<name>.html."""
+
+    pages = {}
+
+    def do_GET(self):
+        self.simulate_latency()
+        match = re.fullmatch(r"/jobs/([\w-]+)\.html", self.path)
+        if match and match.group(1) in self.pages:
+            self.send_body(self.pages[match.group(1)], "text/html; charset=utf-8")
+        else:
+            self.send_body(b"Not found", "text/plain", status=404)
+
+
+# --- Google Calendar API ---
+
+class CalendarHandler(FixtureHandler):
+    """Accepts Calendar v3 event inserts and returns an event with a Meet link."""
+
+    counter = itertools.count(1)
+    events = []
+
+    def do_POST(self):
+        self.simulate_latency()
+        if not re.match(r"/calendar/v3/calendars/[^/]+/events", self.path):
+            self.send_json({"error": {"code": 404, "message": "Not found"}}, status=404)
+            return
+        event = self.read_json()
+        event_id = f"bench{next(self.counter)}"
+        event.update({
+            "id": event_id,
+            "status": "confirmed",
+            "hangoutLink": f"https://meet.google.com/bch-{event_id[-4:].rjust(4, '0')}-fix",
+        })
+        self.events.append(event)
+        self.send_json(event)
+
+
+# --- OpenAI-compatible chat completions ---
+
+def mask_prompt_text(text: str, masked_paths: dict = None) -> str:
+    """
+    Replaces the parts of a prompt that differ between machines: the random ports the stub
+    servers bind, and local paths (e.g. the rendered resumes' absolute path in the checkout)
+    given as {path: placeholder}.
+    """
+    text = re.sub(r"127\.0\.0\.1:\d+", "127.0.0.1", text)
+    # Longest first, so a directory nested inside another masked one keeps its own placeholder
+    for path in sorted(masked_paths or {}, key=len, reverse=True):
+        text = text.replace(path, masked_paths[path])
+    return text
+
+
+def request_key(payload: dict, masked_paths: dict = None) -> str:
+    """Stable key for a chat request: the model plus every message's role and masked content."""
+    messages = [
+        (m.get("role"), mask_prompt_text(str(m.get("content") or ""), masked_paths))
+        for m in payload.get("messages", [])
+    ]
+    return hashlib.sha256(json.dumps([payload.get("model"), messages]).encode("utf-8")).hexdigest()
+
+
+def tool_observations(messages: list) -> list:
+    """
+    Tool results already in the conversation, oldest first.
+
+    With native function calling they arrive as 'tool' messages; with the text protocol they
+    are the 'Observation:' lines of the agent's own assistant turns. System and user messages
+    are skipped, since crewai's tool instructions contain a literal "Observation:" line.
+    """
+    observations = []
+    for message in messages:
+        content = str(message.get("content") or "")
+        if message.get("role") == "tool":
+            observations.append(content.strip())
+        elif message.get("role") == "assistant":
+            observations.extend(
+                observation.strip()
+                for observation in re.findall(r"Observation:\s*(.*?)(?=\n(?:Thought|Action|Observation):|\Z)", content, re.DOTALL)
+            )
+    return observations
+
+
+def extract_variables(messages: list) -> dict:
+    """Pulls the values the scripted responses need out of a crewai prompt."""
+    text = "\n".join(str(m.get("content") or "") for m in messages)
+    observations = tool_observations(messages)
+    last_observation = observations[-1] if observations else ""
+
+    # Resume Parser observations are the repr of a {'text', 'email'} dict
+    observation_text = last_observation
+    resume_email = ""
+    for observation in observations:
+        try:
+            parsed = ast.literal_eval(observation)
+        except (ValueError, SyntaxError):
+            continue
+        if isinstance(parsed, dict):
+            resume_email = parsed.get("email", resume_email)
+            if observation is observations[-1]:
+                observation_text = parsed.get("text", last_observation)
+
+    def first(pattern, flags=0):
+        match = re.search(pattern, text, flags)
+        return match.group(1).strip() if match else ""
+
+    return {
+        "job_url": first(r"from the URL: '([^']+)'"),
+        "resume_file_path": first(r"resume file at '([^']+)'"),
+        "candidate_email": first(r"candidate's email is '([^']+)'"),
+        "preferred_time": first(r"preferred time is '([^']+)'"),
+        "context": first(r"This is the context you're working with:\s*(.*?)(?:\n\s*Begin!|\Z)", re.DOTALL),
+        "observation": last_observation,
+        "observation_text": observation_text,
+        "resume_email": resume_email,
+    }
+
+
+def render_template(template: str, variables: dict) -> str:
+    """Fills {{name}} with the raw value and {{name|json}} with a JSON-escaped string body."""
+    def replace(match):
+        value = str(variables.get(match.group(1), ""))
+        return json.dumps(value)[1:-1] if match.group(2) else value
+    return re.sub(r"\{\{(\w+)(\|json)?\}\}", replace, template)
+
+
+def as_tool_call(content: str, tools: list):
+    """
+    Turns a scripted text-protocol action ("Action: Web Scraper / Action Input: {...}") into a
+    native tool call when the request offers that tool; returns None otherwise.
+    """
+    match = re.search(r"Action:\s*(.+?)\s*\nAction Input:\s*(.*)", content, re.DOTALL)
+    if not match or not tools:
+        return None
+    wanted = re.sub(r"\W+", "_", match.group(1).strip().lower())
+    for tool in tools:
+        name = tool.get("function", {}).get("name", "")
+        if re.sub(r"\W+", "_", name.lower()) == wanted:
+            return {
+                "id": f"call_{hashlib.sha256(content.encode('utf-8')).hexdigest()[:24]}",
+                "type": "function",
+                "function": {"name": name, "arguments": match.group(2).strip()},
+            }
+    return None
+
+
+class LLMHandler(FixtureHandler):
+    """
+    Replays chat completions.
+
+    Requests are first looked up in the recordings (exact prompt match). Anything not
+    recorded falls back to the script, which picks a response by agent role and by how
+    many tool results the conversation already has. Scripted actions are sent as native
+    tool calls when the request offers tools, as plain text otherwise. With record_upstream
+    set, misses are forwarded there and the responses are saved into the recordings.
+    """
+
+    recordings = {}
+    script = []
+    record_upstream = None
+    masked_paths = {}
+    stats = {"recorded": 0, "scripted": 0, "proxied": 0}
+    lock = threading.Lock()
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_json({"error": {"message": "Not found"}}, status=404)
+            return
+        payload = self.read_json()
+        key = request_key(payload, self.masked_paths)
+
+        if key in self.recordings:
+            message = self.recordings[key]
+            self.count("recorded")
+        elif self.record_upstream:
+            message = self.forward(payload)
+            self.recordings[key] = message
+            self.count("proxied")
+        else:
+            content = self.scripted_response(payload.get("messages", []))
+            tool_call = as_tool_call(content, payload.get("tools"))
+            if tool_call:
+                message = {"content": None, "tool_calls": [tool_call]}
+            elif payload.get("tools"):
+                # Function-calling clients use the content as the answer as-is, without the text protocol
+                message = {"content": re.sub(r"\A.*?Final Answer:\s*", "", content, flags=re.DOTALL)}
+            else:
+                message = {"content": content}
+            self.count("scripted")
+
+        # Recordings made before tool calls were supported hold just the content
+        if isinstance(message, str):
+            message = {"content": message}
+        self.simulate_latency()
+        self.send_completion(payload, message)
+
+    def count(self, kind: str):
+        with self.lock:
+            self.stats[kind] += 1
+
+    def forward(self, payload: dict) -> dict:
+        response = requests.post(
+            f"{self.record_upstream.rstrip('/')}/chat/completions",
+            json=dict(payload, stream=False),
+            headers={"Authorization": self.headers.get("Authorization", "")},
+            timeout=300
+        )
+        response.raise_for_status()
+        message = response.json()["choices"][0]["message"]
+        return {key: message[key] for key in ("content", "tool_calls") if message.get(key) is not None}
+
+    def scripted_response(self, messages: list) -> str:
+        system_prompt = next((str(m.get("content")) for m in messages if m.get("role") == "system"), "")
+        prompt = system_prompt or str(messages[0].get("content") if messages else "")
+        variables = extract_variables(messages)
+        step = len(tool_observations(messages))
+
+        candidates = [entry for entry in self.script if f"You are {entry['role']}" in prompt]
+        for entry in sorted(candidates, key=lambda e: e["step"], reverse=True):
+            if entry["step"] <= step:
+                return render_template(entry["response"], variables)
+        return "Thought: I now know the final answer\nFinal Answer: No scripted response for this prompt."
+
+    def send_completion(self, payload: dict, message: dict):
+        created = int(time.time())
+        model = payload.get("model", "stub-model")
+        content = message.get("content")
+        tool_calls = message.get("tool_calls")
+        finish_reason = "tool_calls" if tool_calls else "stop"
+        prompt_tokens = sum(len(str(m.get("content") or "").split()) for m in payload.get("messages", []))
+        completion_tokens = len((content or json.dumps(tool_calls)).split())
+
+        if not payload.get("stream"):
+            self.send_json({
+                "id": f"chatcmpl-{created}",
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": dict(message, role="assistant"), "finish_reason": finish_reason}],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens
+                }
+            })
+            return
+
+        # Streaming clients get the whole answer as a single chunk
+        delta = {"role": "assistant", "content": content}
+        if tool_calls:
+            delta["tool_calls"] = [dict(call, index=index) for index, call in enumerate(tool_calls)]
+        chunks = [
+            {"choices": [{"index": 0, "delta": delta, "finish_reason": None}]},
+            {"choices": [{"index": 0, "delta": {}, "finish_reason": finish_reason}]},
+        ]
+        body = b""
+        for chunk in chunks:
+            chunk.update({"id": f"chatcmpl-{created}", "object": "chat.completion.chunk", "created": created, "model": model})
+            body += f"data: {json.dumps(chunk)}\n\n".encode("utf-8")
+        body += b"data: [DONE]\n\n"
+        self.send_body(body, "text/event-stream")
@@ -15,3 +15,54 @@ DEFAULT_INTERVIEW_TIME = "2025-08-12 03:00 PM"  # <--- Added to fix error
 # Scoring thresholds
 MINIMUM_PASSING_SCORE = 80  # Final decision score for interview
 DEFAULT_EMBEDDING_THRESHOLD = 70.0  # Initial similarity score to pass to next stage
+
+# Prompt compaction for the LLM Analyst stage
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "1500"))  # Max tokens of resume + JD text sent to the LLM
+PROMPT_JOB_DESCRIPTION_SHARE = float(os.getenv("PROMPT_JOB_DESCRIPTION_SHARE", "0.4"))  # Fraction of the budget reserved for the JD
+PROMPT_SECTION_MAX_WORDS = int(os.getenv("PROMPT_SECTION_MAX_WORDS", "80"))  # Size of the sections that get ranked
+PROMPT_TOKENIZER_ENCODING = os.getenv("PROMPT_TOKENIZER_ENCODING", "cl100k_base")
+PROMPT_TOKENIZER_CACHE_DIR = os.getenv("TIKTOKEN_CACHE_DIR", "data/tiktoken")  # tiktoken's BPE files, downloaded on first use
+PROMPT_TOKENIZER_RETRY_SECONDS = float(os.getenv("PROMPT_TOKENIZER_RETRY_SECONDS", "60"))  # Retry interval after a failed tokenizer load
+
+# Job page fetching
+JOB_PAGE_TIMEOUT_SECONDS = float(os.getenv("JOB_PAGE_TIMEOUT_SECONDS", "15"))
+JOB_PAGE_CACHE_SECONDS = float(os.getenv("JOB_PAGE_CACHE_SECONDS", "300"))  # Long enough for one run to fetch each page once
+
+# Embedding backend used by the Embedding Matcher and prompt compaction
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "all-MiniLM-L6-v2")
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")  # One of: torch, onnx, onnx-int8
+EMBEDDING_ONNX_INT8_FILE = os.getenv("EMBEDDING_ONNX_INT8_FILE", "")  # Pre-quantized file in the model repo; empty picks one for the CPU
+EMBEDDING_INTRA_OP_THREADS = int(os.getenv("EMBEDDING_INTRA_OP_THREADS", "0"))  # 0 keeps the runtime default
+
+# Google Calendar API base URL override, including /calendar/v3/ (e.g. a local fake server for benchmarks);
+# uses anonymous credentials when set
+GOOGLE_CALENDAR_API_ENDPOINT = os.getenv("GOOGLE_CALENDAR_API_ENDPOINT")
+
+# Multi-requisition screening
+MULTI_REQUISITION_TOP_K = int(os.getenv("MULTI_REQUISITION_TOP_K", "3"))  # Resumes per role sent to LLM verification
+MULTI_REQUISITION_MIN_SIMILARITY = float(os.getenv("MULTI_REQUISITION_MIN_SIMILARITY", "0"))  # Optional floor on the shortlist; 0 ranks by top_k alone
+
+# Workflow checkpoints: completed stages are stored here and skipped when a run is retried
+WORKFLOW_CHECKPOINTS_ENABLED = os.getenv("WORKFLOW_CHECKPOINTS", "1") == "1"
+CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR", "data/checkpoints")
+CHECKPOINT_TTL_HOURS = float(os.getenv("CHECKPOINT_TTL_HOURS", "168"))  # Older checkpoints are ignored and deleted; 0 keeps them forever
+
+# Screening API (src/api_server.py)
+API_HOST = os.getenv("API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("API_PORT", "8000"))
+API_WORKERS = int(os.getenv("API_WORKERS", "2"))  # Background screening jobs run concurrently
+API_JOB_TTL_MINUTES = float(os.getenv("API_JOB_TTL_MINUTES", "60"))  # Finished jobs are dropped from the status table after this
+
+# Uploaded resume storage: content-addressed, so identical files are stored once
+RESUME_STORE_DIR = os.getenv("RESUME_STORE_DIR", "data/resumes")
+MAX_UPLOAD_FILE_MB = int(os.getenv("MAX_UPLOAD_FILE_MB", "10"))  # Per-file cap (keep in sync with .streamlit/config.toml)
+MAX_UPLOAD_BATCH_MB = int(os.getenv("MAX_UPLOAD_BATCH_MB", "100"))  # Cap on all files submitted together
+RESUME_STORE_MAX_AGE_HOURS = float(os.getenv("RESUME_STORE_MAX_AGE_HOURS", "72"))  # Older files are evicted
+RESUME_STORE_QUOTA_MB = int(os.getenv("RESUME_STORE_QUOTA_MB", "1024"))  # Oldest files are evicted above this
+RESUME_STORE_LEASE_MINUTES = float(os.getenv("RESUME_STORE_LEASE_MINUTES", "30"))  # Files a run touched this recently are never evicted
+
+# Profiling: wraps screening runs with a sampling profiler and tracemalloc
+PROFILING_ENABLED = os.getenv("HIRING_AGENT_PROFILE", "0") == "1"
+PROFILE_OUTPUT_DIR = os.getenv("PROFILE_OUTPUT_DIR", "data/profiles")
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+PROFILE_TRACEMALLOC_TOP_N = int(os.getenv("PROFILE_TRACEMALLOC_TOP_N", "25"))  # 0 disables allocation tracing
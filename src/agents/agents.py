@@ -4,19 +4,54 @@ import os
 import requests
 import re
 import json
+import time
+import threading
 from bs4 import BeautifulSoup
 from crewai import Agent, Task, Crew, Process
 from crewai.tools import BaseTool
 # We'll use this library to handle PDFs, need to install it first.
 import fitz
-# For embeddings, you'll need a library like sentence-transformers.
-# pip install sentence-transformers
-from sentence_transformers import SentenceTransformer, util
+# Embeddings run through a pluggable backend (PyTorch or ONNX Runtime), see config/settings.py
+from src.services.embedding_backend import get_embedding_backend
 from src.services.google_calendar import create_google_meet_event
+from config.settings import JOB_PAGE_TIMEOUT_SECONDS, JOB_PAGE_CACHE_SECONDS
 
 
 # --- Custom Tools ---
 
+# Recently fetched job pages: {url: (fetched at, text)}. Entries expire after JOB_PAGE_CACHE_SECONDS,
+# so a screening run fetches each page once but an edited or closed posting is seen on the next run.
+job_page_cache = {}
+job_page_cache_stats = {"hits": 0, "misses": 0}
+job_page_cache_lock = threading.Lock()
+
+
+def scrape_job_description(url: str, max_age_seconds: float = JOB_PAGE_CACHE_SECONDS) -> str:
+    """Fetches a job page and returns its whitespace-normalised text, reusing a copy fetched within max_age_seconds."""
+    with job_page_cache_lock:
+        cached = job_page_cache.get(url)
+        if cached and time.monotonic() - cached[0] < max_age_seconds:
+            job_page_cache_stats["hits"] += 1
+            return cached[1]
+        job_page_cache_stats["misses"] += 1
+
+    # A hanging job board must not hold a screening worker forever
+    response = requests.get(url, timeout=JOB_PAGE_TIMEOUT_SECONDS)
+    # Error pages raise instead of being returned (and cached) as a job description
+    response.raise_for_status()
+    soup = BeautifulSoup(response.content, 'html.parser')
+    text_content = soup.get_text()
+    # Clean up the text by removing extra whitespace and newlines
+    text = ' '.join(text_content.split())
+
+    with job_page_cache_lock:
+        now = time.monotonic()
+        for expired in [key for key, (fetched, _) in job_page_cache.items() if now - fetched >= max_age_seconds]:
+            del job_page_cache[expired]
+        job_page_cache[url] = (now, text)
+    return text
+
+
 class ResumeParserTool(BaseTool):
     name: str = "Resume Parser"
     description: str = "Parses a PDF file and returns its text content and email address."
@@ -46,12 +81,7 @@ class WebScraperTool(BaseTool):
     def _run(self, url: str) -> str:
         """Scrapes the text from a web page."""
         try:
-            response = requests.get(url)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            text_content = soup.get_text()
-            # Clean up the text by removing extra whitespace and newlines
-            clean_text = ' '.join(text_content.split())
-            return clean_text
+            return scrape_job_description(url)
         except Exception as e:
             return f"Error scraping URL: {e}"
 
@@ -65,10 +95,7 @@ class EmbeddingMatcherTool(BaseTool):
 
     def _run(self, resume_text: str, job_description: str) -> float:
         """Calculates the similarity score between two texts."""
-        model = SentenceTransformer('all-MiniLM-L6-v2')
-        resume_embedding = model.encode(resume_text, convert_to_tensor=True)
-        job_embedding = model.encode(job_description, convert_to_tensor=True)
-        score = util.pytorch_cos_sim(resume_embedding, job_embedding).item()
+        score = get_embedding_backend().similarity(resume_text, job_description)
         return score * 100
 
 
@@ -0,0 +1,211 @@
+# src/api_server.py
+#
+# HTTP screening API. Resumes and a job URL are submitted, queued onto a
+# background worker pool, and tracked by job id:
+#
+#   python -m src.api_server
+#   curl -F resume_file=@resume.pdf -F job_url=https://... http://127.0.0.1:8000/api/jobs
+#   curl http://127.0.0.1:8000/api/jobs/<job_id>
+#   curl -N http://127.0.0.1:8000/api/jobs/<job_id>/events
+
+import os
+import sys
+import json
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Request, Response, jsonify, render_template, request
+from werkzeug.utils import secure_filename
+
+# Ensure absolute imports work
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.resume_processor import run_recruitment_workflow, summarize_screening_result
+from src.services.resume_store import StreamingIngest, UploadTooLargeError, evict_stored_resumes
+from config.settings import API_HOST, API_PORT, API_WORKERS, API_JOB_TTL_MINUTES, MAX_UPLOAD_BATCH_MB
+
+ALLOWED_EXTENSIONS = {".pdf", ".docx"}
+
+
+class DiskStreamingRequest(Request):
+    """Hashes and writes every uploaded file straight to the resume store instead of memory."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Every temp file opened for this request, so an aborted upload can clean up all of them
+        self.ingests = []
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        ingest = StreamingIngest()
+        self.ingests.append(ingest)
+        return ingest
+
+
+app = Flask(__name__, template_folder=os.path.join(os.path.dirname(__file__), '..', 'templates'))
+app.request_class = DiskStreamingRequest
+app.config["MAX_CONTENT_LENGTH"] = MAX_UPLOAD_BATCH_MB * 1024 * 1024
+
+executor = ThreadPoolExecutor(max_workers=API_WORKERS, thread_name_prefix="screening")
+jobs = {}
+# Stored resume of each queued or running job, kept safe from store eviction
+job_files = {}
+jobs_lock = threading.Lock()
+
+
+def update_job(job_id: str, **changes):
+    with jobs_lock:
+        jobs[job_id].update(changes, updated=time.time())
+
+
+def evict_finished_jobs(ttl_minutes: float = API_JOB_TTL_MINUTES) -> int:
+    """Drops completed and failed jobs that finished more than ttl_minutes ago. Returns the number removed."""
+    cutoff = time.time() - ttl_minutes * 60
+    with jobs_lock:
+        expired = [job_id for job_id, job in jobs.items() if job.get("finished") and job["finished"] < cutoff]
+        for job_id in expired:
+            del jobs[job_id]
+    return len(expired)
+
+
+def job_snapshot(job_id: str) -> dict:
+    with jobs_lock:
+        job = jobs.get(job_id)
+        return json.loads(json.dumps(job)) if job else None
+
+
+def save_upload(file_storage) -> dict:
+    """Moves a streamed upload to its content-addressed path; it was hashed while being written."""
+    upload = file_storage.stream.commit(file_storage.filename)
+    upload["filename"] = secure_filename(file_storage.filename or "") or "resume"
+    return upload
+
+
+def run_screening_job(job_id: str, file_path: str, job_url: str):
+    """Worker entry point: runs the workflow and records per-stage progress on the job."""
+    update_job(job_id, status="running", started=time.time())
+
+    def record_stage(stage_name: str, seconds: float):
+        with jobs_lock:
+            jobs[job_id]["stages"].append({"stage": stage_name, "seconds": round(seconds, 3)})
+            jobs[job_id]["updated"] = time.time()
+
+    try:
+        crew_output = run_recruitment_workflow(
+            resume_file_path=file_path,
+            job_url=job_url,
+            stage_callback=record_stage
+        )
+        update_job(job_id, status="completed", result=summarize_screening_result(crew_output), finished=time.time())
+    except Exception as e:
+        update_job(job_id, status="failed", error=str(e), finished=time.time())
+    finally:
+        with jobs_lock:
+            job_files.pop(job_id, None)
+
+
+def discard_uploads(keep=()):
+    """Removes the temp files of every upload in the request that is not being kept."""
+    kept_streams = [file_storage.stream for file_storage in keep]
+    for ingest in request.ingests:
+        if not any(ingest is stream for stream in kept_streams):
+            ingest.discard()
+
+
+@app.route("/")
+def index():
+    return render_template("index.html")
+
+
+@app.route("/upload", methods=["POST"])
+@app.route("/api/jobs", methods=["POST"])
+def submit_jobs():
+    """Accepts one or more 'resume_file' uploads plus a 'job_url' and queues one job per resume."""
+    job_url = (request.form.get("job_url") or "").strip()
+    uploads = [f for f in request.files.getlist("resume_file") if f and f.filename]
+    if not job_url or not uploads:
+        discard_uploads()
+        return jsonify({"error": "Provide at least one 'resume_file' and a 'job_url'."}), 400
+    bad = [f.filename for f in uploads if os.path.splitext(f.filename)[1].lower() not in ALLOWED_EXTENSIONS]
+    if bad:
+        discard_uploads()
+        return jsonify({"error": f"Unsupported file type: {', '.join(bad)}. Upload PDF or DOCX."}), 400
+
+    discard_uploads(keep=uploads)
+    submitted = []
+    for file_storage in uploads:
+        job_id = uuid.uuid4().hex
+        upload = save_upload(file_storage)
+        with jobs_lock:
+            jobs[job_id] = {
+                "job_id": job_id,
+                "status": "queued",
+                "filename": upload["filename"],
+                "sha256": upload["sha256"],
+                "job_url": job_url,
+                "stages": [],
+                "result": None,
+                "error": None,
+                "created": time.time(),
+                "updated": time.time(),
+            }
+            job_files[job_id] = upload["file_path"]
+        executor.submit(run_screening_job, job_id, upload["file_path"], job_url)
+        submitted.append({"job_id": job_id, "filename": upload["filename"], "status_url": f"/api/jobs/{job_id}"})
+
+    with jobs_lock:
+        in_use = list(job_files.values())
+    evict_stored_resumes(protected_paths=in_use)
+    evict_finished_jobs()
+    return jsonify({"jobs": submitted}), 202
+
+
+@app.route("/api/jobs/<job_id>")
+def get_job(job_id):
+    evict_finished_jobs()
+    job = job_snapshot(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job id."}), 404
+    return jsonify(job)
+
+
+@app.route("/api/jobs/<job_id>/events")
+def stream_job(job_id):
+    """Server-sent events: one message each time the job changes, until it completes or fails."""
+    if job_snapshot(job_id) is None:
+        return jsonify({"error": "Unknown job id."}), 404
+
+    def events():
+        last_update = None
+        while True:
+            job = job_snapshot(job_id)
+            if job is None:
+                return
+            if job["updated"] != last_update:
+                last_update = job["updated"]
+                yield f"data: {json.dumps(job)}\n\n"
+            if job["status"] in ("completed", "failed"):
+                return
+            time.sleep(0.5)
+
+    return Response(events(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.errorhandler(413)
+def upload_too_large(error):
+    for ingest in request.ingests:
+        ingest.discard()
+    return jsonify({"error": f"Upload exceeds the {MAX_UPLOAD_BATCH_MB} MB batch limit."}), 413
+
+
+@app.errorhandler(UploadTooLargeError)
+def file_too_large(error):
+    # The form was only partly parsed, so remove every file this request has written so far
+    for ingest in request.ingests:
+        ingest.discard()
+    return jsonify({"error": error.description}), 413
+
+
+if __name__ == '__main__':
+    print(f"--- Screening API listening on http://{API_HOST}:{API_PORT} with {API_WORKERS} workers ---")
+    app.run(host=API_HOST, port=API_PORT, threaded=True)
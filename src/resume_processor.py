@@ -1,25 +1,245 @@
 # src/resume_processor.py
 
 import os
+import re
+import json
+import time
+import hashlib
 from crewai import Crew, Process, Task
+from crewai.tasks.task_output import TaskOutput
+from crewai.crews.crew_output import CrewOutput
 from src.agents.agents import (
     web_scraper_agent,
     embedding_matcher_agent,
     llm_analyst_agent,
     decision_maker_agent,
-    interview_scheduler_agent
+    interview_scheduler_agent,
+    ResumeParserTool,
+    scrape_job_description
 )
-from config.settings import MINIMUM_PASSING_SCORE
+from src.tools.prompt_compactor import (
+    build_compact_prompt_context,
+    prepare_document,
+    compact_prepared_documents,
+    tokenizer_name
+)
+from src.services.embedding_backend import get_embedding_backend
+from src.services.resume_store import lease_stored_resume
+from src.stage_executor import Stage, StageExecutor, CheckpointStore
+from src.services.profiler import profiled
+from config.settings import (
+    MINIMUM_PASSING_SCORE,
+    MULTI_REQUISITION_TOP_K,
+    MULTI_REQUISITION_MIN_SIMILARITY,
+    PROMPT_TOKEN_BUDGET,
+    PROMPT_JOB_DESCRIPTION_SHARE,
+    PROMPT_SECTION_MAX_WORDS,
+    PROMPT_TOKENIZER_ENCODING,
+    EMBEDDING_MODEL_NAME,
+    EMBEDDING_BACKEND,
+    WORKFLOW_CHECKPOINTS_ENABLED,
+    CHECKPOINT_DIR,
+    CHECKPOINT_TTL_HOURS
+)
+
+
+def compact_prompt_context(resume_text: str, job_description: str) -> dict:
+    """Builds the token-budgeted resume/JD view for the LLM Analyst, safe to embed in a task description."""
+    return prompt_safe_context(build_compact_prompt_context(resume_text, job_description))
+
+
+def prompt_safe_context(compact_context: dict) -> dict:
+    """Logs the compacted size and makes the compacted texts safe to embed in a task description."""
+    print(f"Compacted LLM Analyst input to {compact_context['tokens']} tokens.")
+    # Braces would be treated as input placeholders when crewai interpolates the description
+    for key in ("resume", "job_description"):
+        compact_context[key] = compact_context[key].replace('{', '(').replace('}', ')')
+    return compact_context
+
+
+def build_llm_verification_task(compact_context: dict, context: list = None) -> Task:
+    """Creates the LLM Analyst task over the compacted resume and JD sections."""
+    return Task(
+        description=(
+            "The resume passed the initial filter. Perform a deep, contextual "
+            "analysis of the resume against the job description. Generate a final "
+            f"relevance score out of 100 and a detailed summary. If the score is "
+            f"below {MINIMUM_PASSING_SCORE}, stop here.\n\n"
+            f"Job description (most relevant sections):\n{compact_context['job_description']}\n\n"
+            f"Resume (most relevant sections):\n{compact_context['resume']}"
+        ),
+        agent=llm_analyst_agent,
+        context=context,
+        expected_output="A JSON object containing 'score' (integer) and 'summary' (string)."
+    )
+
+
+def build_decision_task() -> Task:
+    """Creates the Hiring Decision Maker task."""
+    return Task(
+        description=(
+            f"Review the final score and summary from the LLM Analyst. "
+            f"Based on the company policy (score >= {MINIMUM_PASSING_SCORE}), "
+            "make a final decision. Output either 'Proceed with interview' or 'Reject'."
+        ),
+        agent=decision_maker_agent,
+        expected_output="A string: 'Proceed with interview' or 'Reject'."
+    )
+
+
+def parse_llm_analysis(raw: str) -> dict:
+    """Extracts 'score' and 'summary' from the LLM Analyst output."""
+    match = re.search(r'\{.*\}', raw or "", re.DOTALL)
+    if match:
+        try:
+            data = json.loads(match.group(0))
+            return {"score": int(float(data.get("score", 0))), "summary": data.get("summary", "Summary not found.")}
+        except (json.JSONDecodeError, TypeError, ValueError):
+            pass
+    return {"score": 0, "summary": "Could not parse LLM summary."}
+
 
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Hashes a file in chunks so large resumes are never fully loaded into memory."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
-def run_recruitment_workflow(resume_file_path: str, job_url: str, preferred_time: str = None, candidate_email: str = None):
+
+def agent_model(agent) -> str:
+    """Name of the model an agent calls."""
+    return getattr(agent.llm, "model", None) or str(agent.llm)
+
+
+def task_fingerprint(task: Task) -> dict:
+    """Everything besides its upstream context that shapes a task's output, for its checkpoint key."""
+    return {
+        "description": task.description,
+        "expected_output": task.expected_output,
+        "agent": task.agent.role,
+        "model": agent_model(task.agent),
+    }
+
+
+def reports_error(output: dict) -> bool:
+    """True if a task's answer passes on a tool error (tools return errors as text rather than raising)."""
+    return re.search(r'\berror\b', output.get("raw") or "", re.IGNORECASE) is not None
+
+
+def task_output_to_dict(task_output: TaskOutput) -> dict:
+    """Serialisable form of a task output for the checkpoint store."""
+    return {
+        "description": task_output.description,
+        "expected_output": task_output.expected_output,
+        "raw": task_output.raw,
+        "agent": task_output.agent,
+        "json_dict": task_output.json_dict,
+    }
+
+
+def task_output_from_dict(data: dict) -> TaskOutput:
+    return TaskOutput(**data)
+
+
+def with_own_agents(tasks: list) -> list:
+    """
+    Gives each task a private copy of its agent. The agents are module-level, and crewai keeps
+    per-run state on them (crew, executor, tools handler), so concurrent runs must not share them.
+    """
+    for task in tasks:
+        task.agent = task.agent.copy()
+    return tasks
+
+
+def run_single_task(task: Task, inputs: dict) -> dict:
+    """Runs one task in its own crew and returns its serialised output."""
+    with_own_agents([task])
+    crew = Crew(
+        agents=[task.agent],
+        tasks=[task],
+        process=Process.sequential,
+        verbose=True
+    )
+    result = crew.kickoff(inputs=inputs)
+    return task_output_to_dict(result.tasks_output[0])
+
+
+def restored_context(*outputs: dict) -> list:
+    """Stand-in tasks carrying earlier stage outputs, so a task sees the same context as in one crew run."""
+    context_tasks = []
+    for output in outputs:
+        context_task = Task(description=output["description"], expected_output=output["expected_output"] or "")
+        context_task.output = task_output_from_dict(output)
+        context_tasks.append(context_task)
+    return context_tasks
+
+
+def summarize_screening_result(crew_output) -> dict:
+    """Pulls the decision, LLM score/summary and candidate email out of a workflow result."""
+    summary = {
+        "decision": "Could not parse final decision.",
+        "score": 0,
+        "summary": "Could not parse LLM summary.",
+        "email": "Email not found",
+    }
+    for task_output in crew_output.tasks_output:
+        if task_output.agent == "Hiring Decision Maker":
+            summary["decision"] = task_output.raw.strip()
+        elif task_output.agent == "LLM Analyst":
+            summary.update(parse_llm_analysis(task_output.raw))
+        elif task_output.agent == "Embedding Matcher":
+            email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', task_output.raw or "")
+            if email_match:
+                summary["email"] = email_match.group(0)
+        elif task_output.agent == "Interview Scheduler":
+            summary["scheduling"] = task_output.raw.strip()
+    return summary
+
+
+# Completed stages are persisted here, so a retry only re-runs the stage that failed
+checkpoint_store = CheckpointStore(CHECKPOINT_DIR, enabled=WORKFLOW_CHECKPOINTS_ENABLED, ttl_hours=CHECKPOINT_TTL_HOURS)
+
+
+@profiled("recruitment_workflow")
+def run_recruitment_workflow(resume_file_path: str, job_url: str, preferred_time: str = None, candidate_email: str = None,
+                             stage_callback=None, only_stage: str = None, force: bool = False):
     """
     Runs the full recruitment workflow.
     Screening phase runs without requiring preferred_time or candidate_email.
     Scheduling phase runs only if both preferred_time and candidate_email are provided.
+    If stage_callback is given, it is called as stage_callback(stage_name, seconds) after each stage.
+
+    Each stage's output is checkpointed by its inputs (including its prompt, the model and the
+    fetched job description), so a retry skips the stages that already completed. Stages whose
+    answer reports an error are not checkpointed. only_stage re-runs a single stage
+    (e.g. 'Interview Scheduler') on its own, and force ignores existing checkpoints.
+
+    The @profiled decorator adds a profile keyword: pass profile=True (or set HIRING_AGENT_PROFILE=1)
+    to write a flamegraph and allocation report for the run.
     """
     print("--- Starting the Hybrid Recruitment Workflow ---")
 
+    checkpoint_store.evict()
+    # Keeps the resume safe from store eviction in other processes while this run reads it
+    lease_stored_resume(resume_file_path)
+    resume_hash = file_sha256(resume_file_path)
+    # Keys use the page content rather than the URL, so an edited posting is screened again.
+    # The Web Scraper tool reads the same cache, so the page is still fetched once.
+    try:
+        job_description = scrape_job_description(job_url)
+    except Exception as e:
+        print(f"⚠ Could not fetch the job description: {e}")
+        job_description = ""
+    job_description_hash = hashlib.sha256(job_description.encode("utf-8")).hexdigest()
+    kickoff_inputs = {
+        'resume_file_path': resume_file_path,
+        'job_url': job_url,
+        'preferred_time': preferred_time or "",
+        'candidate_email': candidate_email or ""
+    }
+
     # --- Task 1: Scrape the job description ---
     scrape_job_description_task = Task(
         description=(
@@ -30,6 +250,9 @@ def run_recruitment_workflow(resume_file_path: str, job_url: str, preferred_time
         expected_output="The full text content of the job description from the given URL."
     )
 
+    def scrape_stage(upstream):
+        return run_single_task(scrape_job_description_task, kickoff_inputs)
+
     # --- Task 2: Initial filtering with embeddings and email extraction ---
     embedding_filter_task = Task(
         description=(
@@ -43,32 +266,76 @@ def run_recruitment_workflow(resume_file_path: str, job_url: str, preferred_time
         expected_output="A JSON object containing 'email' (string) and 'similarity_score' (float)."
     )
 
+    def embedding_filter_stage(upstream):
+        lease_stored_resume(resume_file_path)
+        embedding_filter_task.context = restored_context(upstream["Web Scraper"])
+        return run_single_task(embedding_filter_task, kickoff_inputs)
+
+    # --- Build a token-budgeted view of the resume and JD for the LLM Analyst ---
+    def compaction_stage(upstream):
+        lease_stored_resume(resume_file_path)
+        resume_data = ResumeParserTool()._run(resume_file_path)
+        return compact_prompt_context(resume_data["text"], job_description)
+
     # --- Task 3: Detailed LLM verification ---
-    llm_verification_task = Task(
-        description=(
-            "The resume passed the initial filter. Perform a deep, contextual "
-            "analysis of the resume against the job description. Generate a final "
-            f"relevance score out of 100 and a detailed summary. If the score is "
-            f"below {MINIMUM_PASSING_SCORE}, stop here."
-        ),
-        agent=llm_analyst_agent,
-        expected_output="A JSON object containing 'score' (integer) and 'summary' (string)."
-    )
+    # Only the embedding filter result is passed as context; the resume and JD go into the
+    # description as compacted sections rather than the full scraped page and resume text.
+    def llm_verification_stage(upstream):
+        llm_verification_task = build_llm_verification_task(
+            upstream["Prompt Compaction"],
+            context=restored_context(upstream["Embedding Matcher"])
+        )
+        return run_single_task(llm_verification_task, kickoff_inputs)
 
     # --- Task 4: Make a hiring decision ---
-    decision_task = Task(
-        description=(
-            f"Review the final score and summary from the LLM Analyst. "
-            f"Based on the company policy (score >= {MINIMUM_PASSING_SCORE}), "
-            "make a final decision. Output either 'Proceed with interview' or 'Reject'."
+    decision_task = build_decision_task()
+
+    def decision_stage(upstream):
+        decision_task.context = restored_context(upstream["LLM Analyst"])
+        return run_single_task(decision_task, kickoff_inputs)
+
+    embedding_model = {"embedding_model": EMBEDDING_MODEL_NAME, "embedding_backend": EMBEDDING_BACKEND}
+    # The analyst prompt embeds the compacted texts, which are keyed through Prompt Compaction
+    llm_verification_template = build_llm_verification_task({"resume": "", "job_description": ""})
+    stages = [
+        Stage(
+            "Web Scraper", scrape_stage,
+            inputs=dict(task_fingerprint(scrape_job_description_task), job_url=job_url, job_description=job_description_hash),
+            # The agent paraphrases tool errors, so go by whether the page could be fetched at all
+            succeeded=lambda output: bool(job_description)
         ),
-        agent=decision_maker_agent,
-        expected_output="A string: 'Proceed with interview' or 'Reject'."
-    )
+        Stage(
+            "Embedding Matcher", embedding_filter_stage, ["Web Scraper"],
+            inputs=dict(task_fingerprint(embedding_filter_task), resume=resume_hash, **embedding_model),
+            succeeded=lambda output: re.search(r'similarity_score\W+-?\d', output.get("raw") or "") is not None
+        ),
+        Stage(
+            "Prompt Compaction", compaction_stage,
+            inputs=dict(
+                resume=resume_hash,
+                job_description=job_description_hash,
+                token_budget=PROMPT_TOKEN_BUDGET,
+                job_description_share=PROMPT_JOB_DESCRIPTION_SHARE,
+                section_max_words=PROMPT_SECTION_MAX_WORDS,
+                tokenizer_encoding=PROMPT_TOKENIZER_ENCODING,
+                # Budgets counted with the approximate fallback differ from tiktoken's
+                tokenizer=tokenizer_name(),
+                **embedding_model
+            ),
+            # An unreadable resume or unreachable job page leaves one side empty
+            succeeded=lambda output: bool(output["resume"] and output["job_description"])
+        ),
+        Stage(
+            "LLM Analyst", llm_verification_stage, ["Prompt Compaction", "Embedding Matcher"],
+            inputs=dict(task_fingerprint(llm_verification_template), minimum_passing_score=MINIMUM_PASSING_SCORE)
+        ),
+        Stage(
+            "Hiring Decision Maker", decision_stage, ["LLM Analyst"],
+            inputs=dict(task_fingerprint(decision_task), minimum_passing_score=MINIMUM_PASSING_SCORE)
+        ),
+    ]
 
     # --- Task 5: Schedule interview (ONLY if details provided) ---
-    tasks = [scrape_job_description_task, embedding_filter_task, llm_verification_task, decision_task]
-
     if preferred_time and candidate_email:
         schedule_interview_task = Task(
             description=(
@@ -80,31 +347,137 @@ def run_recruitment_workflow(resume_file_path: str, job_url: str, preferred_time
             agent=interview_scheduler_agent,
             expected_output="A confirmation string containing the meeting link and details."
         )
-        tasks.append(schedule_interview_task)
+
+        def schedule_stage(upstream):
+            schedule_interview_task.context = restored_context(upstream["Hiring Decision Maker"])
+            return run_single_task(schedule_interview_task, kickoff_inputs)
+
+        stages.append(Stage(
+            "Interview Scheduler", schedule_stage, ["Hiring Decision Maker"],
+            inputs=dict(task_fingerprint(schedule_interview_task), candidate_email=candidate_email, preferred_time=preferred_time),
+            # A failed Calendar call must not be cached, or retrying the scheduling would do nothing
+            succeeded=lambda output: not reports_error(output)
+        ))
     else:
         print("⚠ Skipping scheduling task because preferred_time or candidate_email was not provided.")
 
-    # --- Create and run the crew ---
-    recruitment_crew = Crew(
-        agents=[
-            web_scraper_agent,
-            embedding_matcher_agent,
-            llm_analyst_agent,
-            decision_maker_agent,
-            interview_scheduler_agent
-        ],
-        tasks=tasks,
-        process=Process.sequential,
-        verbose=True
-    )
+    # --- Run the stages, resuming from checkpoints ---
+    executor = StageExecutor(checkpoint_store, stage_callback=stage_callback)
+    outputs = executor.run(stages, only=only_stage, force=force)
 
-    result = recruitment_crew.kickoff(inputs={
-        'resume_file_path': resume_file_path,
-        'job_url': job_url,
-        'preferred_time': preferred_time or "",
-        'candidate_email': candidate_email or ""
-    })
+    # Same shape as a single crew run, so callers can keep reading tasks_output
+    tasks_output = [
+        task_output_from_dict(outputs[stage.name])
+        for stage in stages
+        if stage.name in outputs and stage.name != "Prompt Compaction"
+    ]
+    result = CrewOutput(raw=tasks_output[-1].raw if tasks_output else "", tasks_output=tasks_output)
 
     print("--- Workflow Finished ---")
     print(result)
-    return result
\ No newline at end of file
+    return result
+
+
+@profiled("multi_requisition_screening")
+def run_multi_requisition_screening(resume_file_paths: list, job_urls: list, top_k: int = MULTI_REQUISITION_TOP_K,
+                                    min_similarity: float = MULTI_REQUISITION_MIN_SIMILARITY, stage_callback=None) -> dict:
+    """
+    Screens one pool of resumes against several job descriptions at once.
+
+    Each resume is parsed and embedded once and each job description is scraped and
+    embedded once. The full resume x JD similarity matrix is computed in a single
+    matrix product, and the top_k resumes per role go on to LLM verification. Their
+    prompt sections are also embedded once per document and reused across pairs.
+
+    Args:
+        resume_file_paths (list): Paths of the uploaded resumes
+        job_urls (list): Job description URLs, one per open requisition
+        top_k (int): Resumes per requisition sent to the LLM Analyst
+        min_similarity (float): Similarity score (cosine x 100) a resume needs to be shortlisted;
+                                0 disables the floor, so negative similarities still rank
+        stage_callback: Optional stage_callback(stage_name, seconds), as in run_recruitment_workflow
+        profile (bool): Keyword added by the @profiled decorator; profiles this run, defaults to HIRING_AGENT_PROFILE
+
+    Returns:
+        dict: {job_url: ranked shortlist}, each entry a dict with 'file_path', 'email',
+              'similarity_score', 'score', 'summary' and 'decision'
+    """
+    print(f"--- Screening {len(resume_file_paths)} resumes against {len(job_urls)} requisitions ---")
+    stage_started = time.perf_counter()
+
+    def record_stage(stage_name: str):
+        nonlocal stage_started
+        now = time.perf_counter()
+        if stage_callback:
+            stage_callback(stage_name, now - stage_started)
+        stage_started = now
+
+    # --- Parse every resume and scrape every JD exactly once ---
+    parser = ResumeParserTool()
+    for path in resume_file_paths:
+        lease_stored_resume(path)
+    resumes = [dict(parser._run(path), file_path=path) for path in resume_file_paths]
+    record_stage("Resume Parsing")
+
+    shortlists = {}
+    jobs = []
+    for job_url in job_urls:
+        try:
+            jobs.append({"url": job_url, "text": scrape_job_description(job_url)})
+        except Exception as e:
+            print(f"⚠ Skipping requisition {job_url}: {e}")
+            shortlists[job_url] = []
+    record_stage("Job Scraping")
+
+    if not resumes or not jobs:
+        return shortlists
+
+    # --- Embed both sides in batches and score every pair in one operation ---
+    backend = get_embedding_backend()
+    resume_embeddings = backend.encode([resume["text"] for resume in resumes])
+    job_embeddings = backend.encode([job["text"] for job in jobs])
+    similarity = resume_embeddings @ job_embeddings.T * 100
+    record_stage("Embedding Matching")
+
+    # --- LLM verification for the top matches of each requisition ---
+    for job_index, job in enumerate(jobs):
+        ranked = sorted(range(len(resumes)), key=lambda i: similarity[i, job_index], reverse=True)
+        if min_similarity:
+            ranked = [i for i in ranked if similarity[i, job_index] >= min_similarity]
+        candidates = ranked[:top_k]
+        print(f"{job['url']}: {len(candidates)} of {len(resumes)} resumes sent to LLM verification.")
+        if candidates:
+            job_document = prepare_document(job["text"], drop_boilerplate=True)
+
+        shortlist = []
+        for resume_index in candidates:
+            resume = resumes[resume_index]
+            # A resume shortlisted for several roles is sectioned and embedded only the first time
+            if "document" not in resume:
+                resume["document"] = prepare_document(resume["text"])
+            compact_context = prompt_safe_context(compact_prepared_documents(resume["document"], job_document))
+            tasks = with_own_agents([build_llm_verification_task(compact_context), build_decision_task()])
+            crew = Crew(
+                agents=[task.agent for task in tasks],
+                tasks=tasks,
+                process=Process.sequential,
+                verbose=True
+            )
+            result = crew.kickoff()
+
+            analysis = parse_llm_analysis(result.tasks_output[0].raw)
+            shortlist.append({
+                "file_path": resume["file_path"],
+                "email": resume["email"],
+                "similarity_score": round(float(similarity[resume_index, job_index]), 2),
+                "score": analysis["score"],
+                "summary": analysis["summary"],
+                "decision": result.tasks_output[-1].raw.strip()
+            })
+
+        shortlist.sort(key=lambda entry: (entry["score"], entry["similarity_score"]), reverse=True)
+        shortlists[job["url"]] = shortlist
+        record_stage("LLM Verification")
+
+    print("--- Multi-Requisition Screening Finished ---")
+    return shortlists
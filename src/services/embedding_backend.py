@@ -0,0 +1,122 @@
+# src/services/embedding_backend.py
+
+import platform
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+import numpy as np
+from config.settings import (
+    EMBEDDING_MODEL_NAME,
+    EMBEDDING_BACKEND,
+    EMBEDDING_ONNX_INT8_FILE,
+    EMBEDDING_INTRA_OP_THREADS
+)
+
+
+class EmbeddingBackend(ABC):
+    """Common interface for the sentence embedding runtimes used on screening hosts."""
+
+    name = "base"
+
+    @abstractmethod
+    def encode(self, texts) -> np.ndarray:
+        """Returns L2-normalised embeddings, one row per text."""
+
+    def similarity(self, text_a: str, text_b: str) -> float:
+        """Cosine similarity between two texts."""
+        embeddings = self.encode([text_a, text_b])
+        return float(embeddings[0] @ embeddings[1])
+
+
+class TorchEmbeddingBackend(EmbeddingBackend):
+    """Full-precision PyTorch model through sentence-transformers."""
+
+    name = "torch"
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL_NAME, intra_op_threads: int = EMBEDDING_INTRA_OP_THREADS):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if intra_op_threads > 0:
+            torch.set_num_threads(intra_op_threads)
+        self.model = SentenceTransformer(model_name, device="cpu")
+
+    def encode(self, texts) -> np.ndarray:
+        return self.model.encode(list(texts), convert_to_numpy=True, normalize_embeddings=True)
+
+
+def default_int8_onnx_file(cpuinfo_path: str = "/proc/cpuinfo") -> str:
+    """
+    Picks the pre-quantized ONNX file in the model repo that this CPU can run fast.
+    The AVX-512 variants are slower or unusable on AVX2-only hosts, so they are only
+    chosen when the CPU advertises them.
+    """
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return "onnx/model_qint8_arm64.onnx"
+    try:
+        with open(cpuinfo_path) as f:
+            flags = next((line.split(":", 1)[1].split() for line in f if line.startswith("flags")), [])
+    except OSError:
+        flags = []
+    if "avx512_vnni" in flags:
+        return "onnx/model_qint8_avx512_vnni.onnx"
+    if "avx512f" in flags and "avx512bw" in flags:
+        return "onnx/model_qint8_avx512.onnx"
+    return "onnx/model_quint8_avx2.onnx"
+
+
+class OnnxEmbeddingBackend(EmbeddingBackend):
+    """ONNX Runtime model through sentence-transformers, optionally int8-quantized."""
+
+    name = "onnx"
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL_NAME, intra_op_threads: int = EMBEDDING_INTRA_OP_THREADS,
+                 quantized: bool = False, onnx_file: str = EMBEDDING_ONNX_INT8_FILE):
+        import onnxruntime
+        from sentence_transformers import SentenceTransformer
+
+        session_options = onnxruntime.SessionOptions()
+        if intra_op_threads > 0:
+            session_options.intra_op_num_threads = intra_op_threads
+        model_kwargs = {"provider": "CPUExecutionProvider", "session_options": session_options}
+        if quantized:
+            model_kwargs["file_name"] = onnx_file or default_int8_onnx_file()
+            self.name = "onnx-int8"
+        self.model = SentenceTransformer(model_name, device="cpu", backend="onnx", model_kwargs=model_kwargs)
+
+    def encode(self, texts) -> np.ndarray:
+        return self.model.encode(list(texts), convert_to_numpy=True, normalize_embeddings=True)
+
+
+BACKENDS = {
+    "torch": lambda threads: TorchEmbeddingBackend(intra_op_threads=threads),
+    "onnx": lambda threads: OnnxEmbeddingBackend(intra_op_threads=threads),
+    "onnx-int8": lambda threads: OnnxEmbeddingBackend(intra_op_threads=threads, quantized=True),
+}
+
+
+# lru_cache does not stop two threads that miss at the same time from both loading the model
+backend_load_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def load_embedding_backend(name: str, intra_op_threads: int) -> EmbeddingBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{name}'. Expected one of: {', '.join(BACKENDS)}")
+    print(f"Loading '{name}' embedding backend...")
+    return BACKENDS[name](intra_op_threads)
+
+
+def get_embedding_backend(name: str = EMBEDDING_BACKEND, intra_op_threads: int = EMBEDDING_INTRA_OP_THREADS) -> EmbeddingBackend:
+    """
+    Loads an embedding backend once per process, even when several workers ask for it on a cold start.
+
+    Args:
+        name (str): One of 'torch', 'onnx' or 'onnx-int8'
+        intra_op_threads (int): Threads per operator, 0 for the runtime default
+
+    Returns:
+        EmbeddingBackend: The cached backend instance
+    """
+    with backend_load_lock:
+        return load_embedding_backend(name, intra_op_threads)
@@ -7,6 +7,8 @@ import pytz
 from googleapiclient.discovery import build
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
+from google.auth.credentials import AnonymousCredentials
+from config.settings import GOOGLE_CALENDAR_API_ENDPOINT
 
 SCOPES = ['https://www.googleapis.com/auth/calendar']
 
@@ -39,6 +41,17 @@ def authenticate_google_calendar():
     
     return creds
 
+def build_calendar_service():
+    """Builds the Calendar API client, pointed at GOOGLE_CALENDAR_API_ENDPOINT if one is configured."""
+    if GOOGLE_CALENDAR_API_ENDPOINT:
+        return build(
+            'calendar', 'v3',
+            credentials=AnonymousCredentials(),
+            client_options={"api_endpoint": GOOGLE_CALENDAR_API_ENDPOINT}
+        )
+    creds = authenticate_google_calendar()
+    return build('calendar', 'v3', credentials=creds)
+
 def create_google_meet_event(candidate_email: str, preferred_time: str, recruiter_email: str):
     """
     Create a Google Calendar event with Google Meet integration.
@@ -53,8 +66,7 @@ def create_google_meet_event(candidate_email: str, preferred_time: str, recruite
     """
     try:
         # Authenticate and build service
-        creds = authenticate_google_calendar()
-        service = build('calendar', 'v3', credentials=creds)
+        service = build_calendar_service()
         
         # Parse the preferred time
         tz = pytz.timezone("Asia/Kolkata")  # Adjust timezone as needed
@@ -128,8 +140,7 @@ def create_google_meet_event(candidate_email: str, preferred_time: str, recruite
 def list_upcoming_events(max_results=10):
     """List upcoming events from Google Calendar."""
     try:
-        creds = authenticate_google_calendar()
-        service = build('calendar', 'v3', credentials=creds)
+        service = build_calendar_service()
         
         # Call the Calendar API
         now = datetime.utcnow().isoformat() + 'Z'  # 'Z' indicates UTC time
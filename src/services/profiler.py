@@ -0,0 +1,193 @@
+# src/services/profiler.py
+
+import os
+import sys
+import json
+import time
+import threading
+import functools
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from config.settings import (
+    PROFILING_ENABLED,
+    PROFILE_OUTPUT_DIR,
+    PROFILE_SAMPLE_INTERVAL_MS,
+    PROFILE_TRACEMALLOC_TOP_N
+)
+
+# Runs already being profiled on this thread, so nested entry points don't start a second profiler
+active_runs = threading.local()
+
+# tracemalloc is process-wide: two runs tracing at once would each stop it under the other,
+# so only one profiled run at a time (e.g. among concurrent API jobs) traces allocations
+tracemalloc_lock = threading.Lock()
+
+
+class SamplingProfiler:
+    """
+    Samples one thread's Python stack from a background thread at a fixed interval.
+    Identical stacks are aggregated rather than stored, which keeps memory flat on long runs.
+    Each sample is weighted by the wall time since the previous one, since the sampler can
+    be delayed while the profiled thread holds the GIL.
+    """
+
+    def __init__(self, interval_ms: float = PROFILE_SAMPLE_INTERVAL_MS, thread_id: int = None):
+        self.interval = interval_ms / 1000
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples = Counter()
+        self.seconds = Counter()
+        self.stop_event = threading.Event()
+        self.sampler = threading.Thread(target=self.sample_loop, name="sampling-profiler", daemon=True)
+        self.started = None
+        self.elapsed = 0.0
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.sampler.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.sampler.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def sample_loop(self):
+        last_sample = time.perf_counter()
+        while not self.stop_event.wait(self.interval):
+            now = time.perf_counter()
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                # Root first, as flamegraph formats expect
+                key = tuple(reversed(stack))
+                self.samples[key] += 1
+                self.seconds[key] += now - last_sample
+            last_sample = now
+
+    def write_collapsed(self, path: str):
+        """Brendan Gregg's collapsed-stack format: 'frame;frame;frame weight' per line, weights in ms."""
+        with open(path, "w") as f:
+            for stack, seconds in self.seconds.most_common():
+                frames = ";".join(
+                    f"{name} ({os.path.basename(filename)}:{line})".replace(";", ",")
+                    for name, filename, line in stack
+                )
+                f.write(f"{frames} {max(1, round(seconds * 1000))}\n")
+
+    def write_speedscope(self, path: str, name: str):
+        """Speedscope 'sampled' profile; open it at https://www.speedscope.app."""
+        frame_index = {}
+        frames = []
+        samples = []
+        weights = []
+        for stack, seconds in self.seconds.items():
+            indices = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indices.append(frame_index[frame])
+            samples.append(indices)
+            weights.append(round(seconds * 1000, 3))
+
+        profile = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "hiring-agent sampling profiler",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 3),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+        with open(path, "w") as f:
+            json.dump(profile, f)
+
+
+def write_allocation_report(path: str, snapshot, top_n: int, peak_bytes: int):
+    """Top-N allocation sites by size from a tracemalloc snapshot."""
+    stats = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ]).statistics("lineno")
+    with open(path, "w") as f:
+        f.write(f"Peak traced memory: {peak_bytes / (1024 * 1024):.1f} MB\n")
+        f.write(f"Top {top_n} allocation sites still alive at the end of the run:\n\n")
+        for index, stat in enumerate(stats[:top_n], start=1):
+            frame = stat.traceback[0]
+            f.write(f"{index:>3}. {stat.size / 1024:>10.1f} KB in {stat.count:>7} blocks  {frame.filename}:{frame.lineno}\n")
+
+
+@contextmanager
+def profile_run(name: str, enabled: bool = PROFILING_ENABLED, output_dir: str = None):
+    """
+    Profiles the enclosed block when enabled and writes, per run, into output_dir
+    (PROFILE_OUTPUT_DIR by default): <name>.collapsed.txt, <name>.speedscope.json and
+    (if tracemalloc is on) <name>.allocations.txt.
+
+    Stack samples cover only the calling thread. The allocation report covers the whole process,
+    so it includes other threads' allocations, and it is skipped for a run that starts while
+    another run is already tracing.
+    """
+    if not enabled or getattr(active_runs, "name", None):
+        yield
+        return
+
+    active_runs.name = name
+    run_name = f"{time.strftime('%Y%m%d-%H%M%S')}-{name}-{os.getpid()}-{threading.get_ident()}"
+    trace_allocations = PROFILE_TRACEMALLOC_TOP_N > 0 and tracemalloc_lock.acquire(blocking=False)
+    if trace_allocations and tracemalloc.is_tracing():
+        # Started outside the profiler; leave it to its owner
+        tracemalloc_lock.release()
+        trace_allocations = False
+    if trace_allocations:
+        tracemalloc.start()
+    elif PROFILE_TRACEMALLOC_TOP_N > 0:
+        print(f"⚠ Skipping allocation tracing for '{name}': tracemalloc is already in use by another run.")
+
+    profiler = SamplingProfiler()
+    profiler.start()
+    try:
+        yield
+    finally:
+        profiler.stop()
+        active_runs.name = None
+
+        output_dir = output_dir or PROFILE_OUTPUT_DIR
+        os.makedirs(output_dir, exist_ok=True)
+        base_path = os.path.join(output_dir, run_name)
+        profiler.write_collapsed(f"{base_path}.collapsed.txt")
+        profiler.write_speedscope(f"{base_path}.speedscope.json", run_name)
+        if trace_allocations:
+            try:
+                snapshot = tracemalloc.take_snapshot()
+                peak_bytes = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            finally:
+                tracemalloc_lock.release()
+            write_allocation_report(f"{base_path}.allocations.txt", snapshot, PROFILE_TRACEMALLOC_TOP_N, peak_bytes)
+        print(f"Profile for '{name}' ({profiler.elapsed:.1f}s, {sum(profiler.samples.values())} samples) written to {base_path}.*")
+
+
+def profiled(name: str):
+    """
+    Decorator for screening entry points. It adds a keyword-only profile argument to the
+    wrapped function: profiling follows PROFILING_ENABLED unless the caller passes profile=True/False.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, profile: bool = None, **kwargs):
+            enabled = PROFILING_ENABLED if profile is None else profile
+            with profile_run(name, enabled=enabled):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
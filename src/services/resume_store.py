@@ -0,0 +1,188 @@
+# src/services/resume_store.py
+
+import os
+import time
+import hashlib
+import tempfile
+from werkzeug.exceptions import RequestEntityTooLarge
+from config.settings import (
+    RESUME_STORE_DIR,
+    MAX_UPLOAD_FILE_MB,
+    RESUME_STORE_MAX_AGE_HOURS,
+    RESUME_STORE_QUOTA_MB,
+    RESUME_STORE_LEASE_MINUTES
+)
+
+CHUNK_SIZE = 1024 * 1024
+MAX_UPLOAD_FILE_BYTES = MAX_UPLOAD_FILE_MB * 1024 * 1024
+
+
+class UploadTooLargeError(RequestEntityTooLarge):
+    """
+    Raised when an upload goes over its size cap. It is an HTTP 413 rather than a ValueError,
+    since werkzeug's form parser silently swallows ValueErrors and would drop the whole form.
+    """
+
+
+class StreamingIngest:
+    """
+    A temp file that hashes bytes as they are written, so an upload is hashed and
+    written to disk in one pass. commit() then moves it to its content-addressed path.
+
+    Can be handed to werkzeug as a file stream; other attributes go to the temp file.
+    """
+
+    def __init__(self, max_bytes: int = MAX_UPLOAD_FILE_BYTES, directory: str = RESUME_STORE_DIR):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.digest = hashlib.sha256()
+        self.size = 0
+        tmp_dir = os.path.join(directory, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        self.file = tempfile.NamedTemporaryFile("wb+", dir=tmp_dir, suffix=".part", delete=False)
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+    def write(self, data) -> int:
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            self.discard()
+            raise UploadTooLargeError(f"File exceeds the {self.max_bytes // (1024 * 1024)} MB limit.")
+        self.digest.update(data)
+        return self.file.write(data)
+
+    def discard(self):
+        self.file.close()
+        if os.path.exists(self.file.name):
+            os.remove(self.file.name)
+
+    def commit(self, original_filename: str) -> dict:
+        """
+        Moves the upload to <store>/<sha[:2]>/<sha><ext>. If that file already exists the
+        temp copy is dropped and the stored one is reused.
+
+        Returns:
+            dict: 'sha256', 'file_path', 'size', 'filename' and 'duplicate'
+        """
+        self.file.close()
+        sha256 = self.digest.hexdigest()
+        extension = os.path.splitext(original_filename or "")[1].lower()
+        file_path = os.path.join(self.directory, sha256[:2], f"{sha256}{extension}")
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        duplicate = os.path.exists(file_path)
+        if duplicate:
+            os.remove(self.file.name)
+            # Refresh the timestamp so age-based eviction treats it as recently used
+            os.utime(file_path)
+        else:
+            os.replace(self.file.name, file_path)
+
+        return {
+            "sha256": sha256,
+            "file_path": file_path,
+            "size": self.size,
+            "filename": original_filename,
+            "duplicate": duplicate,
+        }
+
+
+def ingest_stream(stream, original_filename: str, max_bytes: int = MAX_UPLOAD_FILE_BYTES,
+                  directory: str = RESUME_STORE_DIR) -> dict:
+    """
+    Copies a file-like object into the store in fixed-size chunks.
+
+    Args:
+        stream: Readable binary file-like object (e.g. a Streamlit UploadedFile)
+        original_filename (str): Name the file was uploaded with; its extension is kept
+        max_bytes (int): Per-file size cap
+        directory (str): Root of the resume store
+
+    Returns:
+        dict: See StreamingIngest.commit
+    """
+    ingest = StreamingIngest(max_bytes=max_bytes, directory=directory)
+    try:
+        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+            ingest.write(chunk)
+    except Exception:
+        ingest.discard()
+        raise
+    return ingest.commit(original_filename)
+
+
+def lease_stored_resume(file_path: str, directory: str = RESUME_STORE_DIR) -> bool:
+    """
+    Marks a stored resume as in use by refreshing its timestamp. Eviction in any process
+    skips files leased within the last lease_minutes. Paths outside the store are left alone.
+
+    Returns:
+        bool: True if the file is in the store and was leased
+    """
+    store = os.path.join(os.path.abspath(directory), "")
+    if not os.path.abspath(file_path).startswith(store):
+        return False
+    try:
+        os.utime(file_path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def evict_stored_resumes(max_age_hours: float = RESUME_STORE_MAX_AGE_HOURS, quota_mb: int = RESUME_STORE_QUOTA_MB,
+                         directory: str = RESUME_STORE_DIR, protected_paths=(),
+                         lease_minutes: float = RESUME_STORE_LEASE_MINUTES) -> int:
+    """
+    Deletes stored resumes older than max_age_hours, then the oldest remaining ones
+    until the store fits in quota_mb. Returns the number of files removed.
+
+    Files are never removed while in use, though they still count towards the quota:
+    protected_paths are the ones this process knows about (e.g. queued screening jobs, or
+    resumes a session may still schedule), and files touched within lease_minutes are the
+    ones another process may be screening or scheduling (see lease_stored_resume).
+    """
+    if not os.path.isdir(directory):
+        return 0
+
+    protected = {os.path.abspath(path) for path in protected_paths}
+    now = time.time()
+    tmp_dir = os.path.join(directory, "tmp")
+    removed = 0
+    kept = []
+    for root, _, filenames in os.walk(directory):
+        for filename in filenames:
+            path = os.path.join(root, filename)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            in_use = os.path.abspath(path) in protected or now - stat.st_mtime < lease_minutes * 60
+            if now - stat.st_mtime > max_age_hours * 3600 and not in_use:
+                removed += remove_quietly(path)
+            elif root != tmp_dir:
+                # Uploads still in progress only count towards age, never the quota
+                kept.append((stat.st_mtime, stat.st_size, path, in_use))
+    kept.sort()
+
+    total = sum(size for _, size, _, _ in kept)
+    quota_bytes = quota_mb * 1024 * 1024
+    for mtime, size, path, in_use in kept:
+        if total <= quota_bytes:
+            break
+        if in_use:
+            continue
+        removed += remove_quietly(path)
+        total -= size
+
+    if removed:
+        print(f"Evicted {removed} stored resume file(s) from {directory}.")
+    return removed
+
+
+def remove_quietly(path: str) -> int:
+    try:
+        os.remove(path)
+        return 1
+    except FileNotFoundError:
+        return 0
@@ -0,0 +1,170 @@
+# src/stage_executor.py
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+
+
+class Stage:
+    """
+    One step of a workflow.
+
+    Args:
+        name (str): Unique stage name
+        run: Callable taking {dependency name: output} and returning a JSON-serialisable output
+        depends_on (list): Names of the stages whose outputs this stage needs
+        inputs (dict): Workflow inputs this stage reads; they form part of its checkpoint key
+        succeeded: Optional callable taking the stage's output and returning False if it reports
+                   a failure (e.g. a tool error returned as text). Failed outputs are never checkpointed.
+    """
+
+    def __init__(self, name: str, run, depends_on: list = None, inputs: dict = None, succeeded=None):
+        self.name = name
+        self.run = run
+        self.depends_on = depends_on or []
+        self.inputs = inputs or {}
+        self.succeeded = succeeded or (lambda output: True)
+
+
+class CheckpointStore:
+    """
+    Persists stage outputs as JSON files keyed by a hash of the stage's inputs.
+    Checkpoints older than ttl_hours are treated as missing (0 keeps them forever).
+    """
+
+    def __init__(self, directory: str, enabled: bool = True, ttl_hours: float = 0):
+        self.directory = directory
+        self.enabled = enabled
+        self.ttl_hours = ttl_hours
+        self.stats = {"hits": 0, "misses": 0}
+
+    def expired(self, created: float) -> bool:
+        return bool(self.ttl_hours) and time.time() - created > self.ttl_hours * 3600
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key: str):
+        """Returns (True, output) for a stored checkpoint, otherwise (False, None)."""
+        if self.enabled and os.path.exists(self.path_for(key)):
+            try:
+                with open(self.path_for(key)) as f:
+                    record = json.load(f)
+                if not self.expired(record["created"]):
+                    self.stats["hits"] += 1
+                    return True, record["output"]
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"⚠ Ignoring unreadable checkpoint {key}: {e}")
+        self.stats["misses"] += 1
+        return False, None
+
+    def save(self, key: str, stage_name: str, output):
+        if not self.enabled:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        record = {"stage": stage_name, "created": time.time(), "output": output}
+        # Write to a temp file first so a crash never leaves a half-written checkpoint behind
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(record, f)
+        os.replace(tmp_path, self.path_for(key))
+
+    def evict(self) -> int:
+        """Deletes checkpoints (and leftover temp files) older than ttl_hours. Returns the number removed."""
+        if not self.ttl_hours or not os.path.isdir(self.directory):
+            return 0
+        removed = 0
+        for filename in os.listdir(self.directory):
+            path = os.path.join(self.directory, filename)
+            try:
+                if self.expired(os.stat(path).st_mtime):
+                    os.remove(path)
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        if removed:
+            print(f"Evicted {removed} expired checkpoint(s) from {self.directory}.")
+        return removed
+
+
+class StageExecutor:
+    """
+    Runs a DAG of stages, skipping any stage whose checkpoint already exists.
+
+    A stage's key covers its name, its own inputs and the keys of its dependencies, so a
+    change anywhere upstream invalidates everything downstream of it. Likewise, nothing
+    computed from a failed stage is checkpointed, so a retry runs it again.
+    """
+
+    def __init__(self, store: CheckpointStore, stage_callback=None):
+        self.store = store
+        self.stage_callback = stage_callback
+
+    def stage_key(self, stage: Stage, dependency_keys: dict) -> str:
+        payload = json.dumps(
+            {"stage": stage.name, "inputs": stage.inputs, "depends_on": dependency_keys},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def run(self, stages: list, only: str = None, force: bool = False) -> dict:
+        """
+        Executes the stages in dependency order.
+
+        Args:
+            stages (list): Stage objects; dependencies must be listed before their dependents
+            only (str): If given, re-run just this stage (its dependencies come from checkpoints,
+                        or are computed if they have none) and skip everything downstream
+            force (bool): Ignore existing checkpoints and re-run every stage
+
+        Returns:
+            dict: {stage name: output} for every stage that ran or was restored, failed ones included
+        """
+        by_name = {stage.name: stage for stage in stages}
+        if only and only not in by_name:
+            raise ValueError(f"Unknown stage '{only}'. Expected one of: {', '.join(by_name)}")
+
+        needed = set(by_name)
+        if only:
+            needed = set()
+            pending = [only]
+            while pending:
+                name = pending.pop()
+                if name not in needed:
+                    needed.add(name)
+                    pending.extend(by_name[name].depends_on)
+
+        outputs = {}
+        keys = {}
+        failed = set()
+        for stage in stages:
+            if stage.name not in needed:
+                continue
+            missing = [dep for dep in stage.depends_on if dep not in keys]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on {missing}, which must be listed before it.")
+
+            keys[stage.name] = self.stage_key(stage, {dep: keys[dep] for dep in stage.depends_on})
+            rerun = force or stage.name == only
+            if not rerun:
+                found, output = self.store.load(keys[stage.name])
+                if found:
+                    print(f"✓ Restored '{stage.name}' from checkpoint.")
+                    outputs[stage.name] = output
+                    continue
+
+            started = time.perf_counter()
+            output = stage.run({dep: outputs[dep] for dep in stage.depends_on})
+            if not stage.succeeded(output):
+                print(f"⚠ Stage '{stage.name}' failed; it will run again on retry.")
+                failed.add(stage.name)
+            elif failed.intersection(stage.depends_on):
+                failed.add(stage.name)
+            else:
+                self.store.save(keys[stage.name], stage.name, output)
+            outputs[stage.name] = output
+            if self.stage_callback:
+                self.stage_callback(stage.name, time.perf_counter() - started)
+        return outputs
@@ -0,0 +1,250 @@
+# src/tools/prompt_compactor.py
+
+import os
+import re
+import time
+import threading
+import numpy as np
+from src.services.embedding_backend import get_embedding_backend
+from config.settings import (
+    PROMPT_TOKEN_BUDGET,
+    PROMPT_JOB_DESCRIPTION_SHARE,
+    PROMPT_SECTION_MAX_WORDS,
+    PROMPT_TOKENIZER_ENCODING,
+    PROMPT_TOKENIZER_CACHE_DIR,
+    PROMPT_TOKENIZER_RETRY_SECONDS
+)
+
+# tiktoken downloads its BPE file on first use; keep it somewhere that survives restarts
+os.environ.setdefault("TIKTOKEN_CACHE_DIR", os.path.abspath(PROMPT_TOKENIZER_CACHE_DIR))
+
+# Lines that show up on almost every scraped job page but say nothing about the role.
+# Applied to job pages only.
+BOILERPLATE_PATTERNS = [
+    r'\bcookies?\b',
+    r'\bprivacy (policy|notice)\b',
+    r'\bterms (of (use|service)|and conditions)\b',
+    r'\ball rights reserved\b',
+    r'©|\bcopyright\b',
+    r'\b(sign|log) ?(in|up)\b',
+    r'\bshare (this|on)\b',
+    r'\bsubscribe\b',
+    r'\benable javascript\b',
+    r'\bskip to (main )?content\b',
+    r'\bequal opportunity employer\b',
+]
+BOILERPLATE_REGEX = re.compile('|'.join(BOILERPLATE_PATTERNS), re.IGNORECASE)
+
+
+tokenizer_state = {"encoder": None, "failed_at": None}
+tokenizer_lock = threading.Lock()
+
+
+def get_tokenizer():
+    """
+    Returns the tiktoken encoder, or None while it cannot be loaded (tiktoken missing, or its
+    BPE file not downloaded and the network down). Only a loaded encoder is kept; a failure is
+    retried after PROMPT_TOKENIZER_RETRY_SECONDS, so one transient error does not leave the
+    process on the approximate count for good.
+    """
+    with tokenizer_lock:
+        if tokenizer_state["encoder"] is not None:
+            return tokenizer_state["encoder"]
+        failed_at = tokenizer_state["failed_at"]
+        if failed_at is not None and time.monotonic() - failed_at < PROMPT_TOKENIZER_RETRY_SECONDS:
+            return None
+        try:
+            import tiktoken
+            tokenizer_state["encoder"] = tiktoken.get_encoding(PROMPT_TOKENIZER_ENCODING)
+            tokenizer_state["failed_at"] = None
+        except Exception as e:
+            tokenizer_state["failed_at"] = time.monotonic()
+            print(f"⚠ tiktoken unavailable ({e}), using an approximate token count for now.")
+        return tokenizer_state["encoder"]
+
+
+def tokenizer_name() -> str:
+    """The encoding token counts currently come from, or 'approximate' for the fallback."""
+    return PROMPT_TOKENIZER_ENCODING if get_tokenizer() is not None else "approximate"
+
+
+def count_tokens(text: str) -> int:
+    """Counts tokens with the local tokenizer (approximate if tiktoken is missing)."""
+    tokenizer = get_tokenizer()
+    if tokenizer is not None:
+        return len(tokenizer.encode(text))
+    # Roughly one token per word piece or punctuation mark
+    return len(re.findall(r"\w+|[^\w\s]", text))
+
+
+def split_into_sections(text: str, max_words: int = PROMPT_SECTION_MAX_WORDS, drop_boilerplate: bool = False) -> list:
+    """
+    Splits text into whitespace-normalised sections of at most max_words words.
+    Duplicate lines are dropped, and boilerplate lines too if drop_boilerplate is set.
+
+    Args:
+        text (str): Raw resume or job description text
+        max_words (int): Upper bound on words per section
+        drop_boilerplate (bool): Drop short lines matching BOILERPLATE_REGEX. Only meant for
+                                 scraped job pages; on resumes it would hit real experience
+                                 ("built the sign in flow", "cookie-based sessions")
+
+    Returns:
+        list: Section strings in their original order
+    """
+    # Resumes keep their line breaks; scraped pages are a single line, so also split on sentences
+    pieces = re.split(r'\n\s*\n|\n|(?<=[.!?])\s+(?=[A-Z•\-])|\s*•\s*', text)
+
+    seen = set()
+    lines = []
+    for piece in pieces:
+        line = ' '.join(piece.split())
+        if not line or len(re.findall(r'[A-Za-z]', line)) < 3:
+            continue
+        if drop_boilerplate and BOILERPLATE_REGEX.search(line) and len(line.split()) < 30:
+            continue
+        key = line.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+
+    sections = []
+    current = []
+    current_words = 0
+    for line in lines:
+        words = line.split()
+        # Very long lines (e.g. a scraped page without punctuation) are cut into chunks
+        while len(words) > max_words:
+            if current:
+                sections.append(' '.join(current))
+                current, current_words = [], 0
+            sections.append(' '.join(words[:max_words]))
+            words = words[max_words:]
+        if current_words + len(words) > max_words and current:
+            sections.append(' '.join(current))
+            current, current_words = [], 0
+        current.append(' '.join(words))
+        current_words += len(words)
+    if current:
+        sections.append(' '.join(current))
+    return sections
+
+
+def mean_embedding(embeddings: np.ndarray) -> np.ndarray:
+    """Normalised centroid of a set of embeddings."""
+    centroid = embeddings.mean(axis=0)
+    return centroid / (np.linalg.norm(centroid) or 1.0)
+
+
+def select_sections(sections: list, section_embeddings, query_embedding, token_budget: int) -> list:
+    """
+    Picks the sections most similar to the query until the token budget is used up.
+    Selected sections are returned in their original order so the text still reads naturally.
+    """
+    if not sections or token_budget <= 0:
+        return []
+
+    scores = (section_embeddings @ query_embedding).tolist()
+    ranked = sorted(range(len(sections)), key=lambda i: scores[i], reverse=True)
+
+    # Sections are joined with newlines, so every section after the first also pays for one
+    separator_cost = count_tokens('\n')
+    chosen = []
+    used = 0
+    for index in ranked:
+        cost = count_tokens(sections[index]) + (separator_cost if chosen else 0)
+        if used + cost > token_budget:
+            continue
+        chosen.append(index)
+        used += cost
+
+    # The tokenizer can also merge tokens across the joins, so check the joined text and drop
+    # the lowest-ranked sections until it fits
+    while chosen and count_tokens('\n'.join(sections[i] for i in sorted(chosen))) > token_budget:
+        chosen.pop()
+    return [sections[i] for i in sorted(chosen)]
+
+
+def prepare_document(text: str, drop_boilerplate: bool = False) -> dict:
+    """
+    Splits a document into sections and embeds them once, so the same resume or job
+    description can be compacted against many others without being re-encoded.
+
+    Returns:
+        dict: 'sections' and their 'embeddings' (None when there are no sections)
+    """
+    sections = split_into_sections(text, drop_boilerplate=drop_boilerplate)
+    embeddings = get_embedding_backend().encode(sections) if sections else None
+    return {"sections": sections, "embeddings": embeddings}
+
+
+def keep_leading_sections(resume_sections: list, job_sections: list, token_budget: int) -> dict:
+    """Fallback when one side is empty: there is nothing to rank against, so keep the leading sections that fit."""
+    separator_cost = count_tokens('\n')
+    kept = []
+    used = 0
+    for section in resume_sections or job_sections:
+        cost = count_tokens(section) + (separator_cost if kept else 0)
+        if used + cost > token_budget:
+            break
+        kept.append(section)
+        used += cost
+    while kept and count_tokens('\n'.join(kept)) > token_budget:
+        kept.pop()
+    text = '\n'.join(kept)
+    key = "resume" if resume_sections else "job_description"
+    return {"resume": "", "job_description": "", key: text, "tokens": count_tokens(text)}
+
+
+def compact_prepared_documents(resume: dict, job: dict, token_budget: int = PROMPT_TOKEN_BUDGET) -> dict:
+    """
+    Compacts a resume and job description already run through prepare_document.
+
+    Resume sections are ranked by similarity to the job description and job description
+    sections by similarity to the resume, then each side is filled up to its share of the budget.
+
+    Returns:
+        dict: 'resume' and 'job_description' compacted texts plus 'tokens' used
+    """
+    if not resume["sections"] or not job["sections"]:
+        return keep_leading_sections(resume["sections"], job["sections"], token_budget)
+
+    # Each side's mean embedding is the query for the other side
+    job_budget = int(token_budget * PROMPT_JOB_DESCRIPTION_SHARE)
+    selected_job = select_sections(job["sections"], job["embeddings"], mean_embedding(resume["embeddings"]), job_budget)
+    job_text = '\n'.join(selected_job)
+
+    # Whatever the job description did not use goes to the resume
+    resume_budget = token_budget - count_tokens(job_text)
+    selected_resume = select_sections(resume["sections"], resume["embeddings"], mean_embedding(job["embeddings"]), resume_budget)
+    resume_compact = '\n'.join(selected_resume)
+
+    return {
+        "resume": resume_compact,
+        "job_description": job_text,
+        "tokens": count_tokens(job_text) + count_tokens(resume_compact)
+    }
+
+
+def build_compact_prompt_context(resume_text: str, job_description: str, token_budget: int = PROMPT_TOKEN_BUDGET) -> dict:
+    """
+    Builds a bounded-size view of the resume and job description for the LLM Analyst.
+
+    Args:
+        resume_text (str): Full parsed resume text
+        job_description (str): Full scraped job description text
+        token_budget (int): Total tokens allowed for both texts combined
+
+    Returns:
+        dict: See compact_prepared_documents
+    """
+    resume_sections = split_into_sections(resume_text)
+    job_sections = split_into_sections(job_description, drop_boilerplate=True)
+    if not resume_sections or not job_sections:
+        return keep_leading_sections(resume_sections, job_sections, token_budget)
+
+    backend = get_embedding_backend()
+    resume = {"sections": resume_sections, "embeddings": backend.encode(resume_sections)}
+    job = {"sections": job_sections, "embeddings": backend.encode(job_sections)}
+    return compact_prepared_documents(resume, job, token_budget)
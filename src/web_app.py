@@ -5,13 +5,14 @@ import os
 import sys
 import datetime
 import json
-import hashlib
 from werkzeug.utils import secure_filename
 
 # Ensure absolute imports work
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.resume_processor import run_recruitment_workflow
+from src.resume_processor import run_recruitment_workflow, run_multi_requisition_screening
+from src.services.resume_store import ingest_stream, evict_stored_resumes, UploadTooLargeError
+from config.settings import MAX_UPLOAD_BATCH_MB
 
 # --- App Configuration ---
 st.set_page_config(page_title="Agentic AI Resume Checker", layout="centered")
@@ -27,6 +28,37 @@ if 'job_url' not in st.session_state:
     st.session_state.job_url = ""
 if 'cache' not in st.session_state:
     st.session_state.cache = {}
+if 'shortlists' not in st.session_state:
+    st.session_state.shortlists = {}
+if 'stored_filenames' not in st.session_state:
+    st.session_state.stored_filenames = {}
+
+
+def ingest_uploads(uploaded_files) -> list:
+    """
+    Streams each upload into the content-addressed resume store (hashed and written in
+    one chunked pass) and returns (filename, stored file info) pairs.
+    """
+    batch_size = sum(uploaded_file.size for uploaded_file in uploaded_files)
+    if batch_size > MAX_UPLOAD_BATCH_MB * 1024 * 1024:
+        st.error(f"These files total {batch_size / (1024 * 1024):.1f} MB; the limit per batch is {MAX_UPLOAD_BATCH_MB} MB.")
+        return []
+
+    stored = []
+    for uploaded_file in uploaded_files:
+        filename = secure_filename(uploaded_file.name)
+        uploaded_file.seek(0)
+        try:
+            stored.append((filename, ingest_stream(uploaded_file, uploaded_file.name)))
+        except UploadTooLargeError as e:
+            st.error(f"Skipping {filename}: {e.description}")
+    # Keep this batch and every resume this session may still screen or schedule
+    in_use = [stored_file["file_path"] for _, stored_file in stored]
+    in_use += [data["file_path"] for data in st.session_state.processed_resumes.values() if data.get("file_path")]
+    in_use += list(st.session_state.stored_filenames)
+    evict_stored_resumes(protected_paths=in_use)
+    return stored
+
 
 # --- UI Elements ---
 st.title("Agentic AI Resume Checker")
@@ -52,24 +84,15 @@ if st.button("Check Resumes"):
         st.session_state.show_calendar = False
         st.session_state.selected_candidate = None
 
-        UPLOAD_FOLDER = "data/resumes"
-        os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-
-        for uploaded_file in uploaded_files:
-            filename = secure_filename(uploaded_file.name)
-            file_path = os.path.join(UPLOAD_FOLDER, filename)
-
-            file_hash = hashlib.sha256(uploaded_file.getbuffer()).hexdigest()
-            cache_key = f"{file_hash}-{st.session_state.job_url}"
+        for filename, stored_file in ingest_uploads(uploaded_files):
+            file_path = stored_file["file_path"]
+            cache_key = f"{stored_file['sha256']}-{st.session_state.job_url}"
 
             if cache_key in st.session_state.cache:
                 st.info(f"Using cached result for {filename}...")
                 st.session_state.processed_resumes[filename] = st.session_state.cache[cache_key]
                 continue
 
-            with open(file_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
-
             try:
                 with st.spinner(f"Processing resume: {filename}..."):
                     crew_output = run_recruitment_workflow(
@@ -141,6 +164,46 @@ if st.button("Check Resumes"):
     else:
         st.warning("Please upload at least one resume and provide a job URL.")
 
+# --- Multi-Requisition Screening ---
+with st.expander("Screen against multiple open roles"):
+    job_urls_text = st.text_area(
+        "Job Description URLs (one per line)",
+        help="Every uploaded resume is scored against every role; only the top matches per role go to the LLM."
+    )
+    if st.button("Screen All Roles"):
+        job_urls = [url.strip() for url in job_urls_text.splitlines() if url.strip()]
+        if uploaded_files and job_urls:
+            # Identical uploads share one stored file, so each is screened only once
+            st.session_state.stored_filenames = {
+                stored_file["file_path"]: filename for filename, stored_file in ingest_uploads(uploaded_files)
+            }
+            resume_file_paths = list(st.session_state.stored_filenames)
+
+            try:
+                with st.spinner(f"Screening {len(resume_file_paths)} resumes against {len(job_urls)} roles..."):
+                    st.session_state.shortlists = run_multi_requisition_screening(resume_file_paths, job_urls)
+            except Exception as e:
+                st.error(f"Error screening requisitions: {e}")
+        else:
+            st.warning("Please upload at least one resume and provide at least one job URL.")
+
+if st.session_state.shortlists:
+    st.markdown("---")
+    st.subheader("Shortlists per Role")
+    for role_url, shortlist in st.session_state.shortlists.items():
+        st.markdown(f"**Role:** {role_url}")
+        if not shortlist:
+            st.write("No resumes passed the initial filter for this role.")
+        for rank, entry in enumerate(shortlist, start=1):
+            display_name = st.session_state.stored_filenames.get(entry['file_path'], os.path.basename(entry['file_path']))
+            st.write(
+                f"{rank}. **{display_name}** — Score: {entry['score']}/100, "
+                f"Similarity: {entry['similarity_score']}, Decision: {entry['decision']}, Email: {entry['email']}"
+            )
+            with st.expander(f"Show LLM Summary ({display_name})"):
+                st.write(entry['summary'])
+        st.markdown("---")
+
 # --- Display Results ---
 if st.session_state.processed_resumes:
     st.markdown("---")
@@ -200,6 +263,7 @@ if st.session_state.processed_resumes:
 
                 with st.spinner(f"Scheduling interview for {selected_candidate}..."):
                     try:
+                        # Screening stages are restored from checkpoints, so only the scheduler runs here
                         crew_output_scheduling = run_recruitment_workflow(
                             resume_file_path=file_path_for_scheduling,
                             job_url=st.session_state.job_url,
@@ -0,0 +1,55 @@
+# tests/test_agents.py
+
+import pytest
+import requests
+from src.agents import agents
+from src.agents.agents import WebScraperTool, scrape_job_description
+
+
+class FakeResponse:
+    def __init__(self, html: str, status: int = 200):
+        self.content = html.encode("utf-8")
+        self.status_code = status
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+
+@pytest.fixture
+def job_board(monkeypatch):
+    """Serves whatever is in `pages` and records each request's timeout."""
+    board = {"pages": {}, "timeouts": []}
+
+    def get(url, timeout=None):
+        board["timeouts"].append(timeout)
+        html, status = board["pages"][url]
+        return FakeResponse(html, status)
+
+    monkeypatch.setattr(agents.requests, "get", get)
+    monkeypatch.setattr(agents, "job_page_cache", {})
+    return board
+
+
+def test_job_pages_are_fetched_with_a_timeout(job_board):
+    job_board["pages"]["https://jobs.example.com/1"] = ("<h1>Gen AI   Engineer</h1>\n<p>Python</p>", 200)
+    assert scrape_job_description("https://jobs.example.com/1") == "Gen AI Engineer Python"
+    assert job_board["timeouts"] == [agents.JOB_PAGE_TIMEOUT_SECONDS]
+
+
+def test_job_pages_are_reused_only_within_the_cache_window(job_board):
+    url = "https://jobs.example.com/1"
+    job_board["pages"][url] = ("<p>Original posting</p>", 200)
+    assert scrape_job_description(url) == "Original posting"
+
+    job_board["pages"][url] = ("<p>Edited posting</p>", 200)
+    assert scrape_job_description(url) == "Original posting"
+    assert scrape_job_description(url, max_age_seconds=0) == "Edited posting"
+    assert len(job_board["timeouts"]) == 2
+
+
+def test_error_pages_are_reported_and_not_cached(job_board):
+    url = "https://jobs.example.com/closed"
+    job_board["pages"][url] = ("<p>Not found</p>", 404)
+    assert WebScraperTool()._run(url).startswith("Error scraping URL")
+    assert url not in agents.job_page_cache
@@ -0,0 +1,161 @@
+# tests/test_api_server.py
+
+import io
+import os
+import json
+import time
+import threading
+import functools
+import pytest
+from src import api_server
+from src.services.resume_store import StreamingIngest, evict_stored_resumes
+
+
+def stored_files(directory):
+    return sorted(filename for _, _, filenames in os.walk(directory) for filename in filenames)
+
+
+@pytest.fixture
+def store_dir(tmp_path, monkeypatch):
+    directory = str(tmp_path / "resumes")
+    monkeypatch.setattr(api_server, "StreamingIngest",
+                        functools.partial(StreamingIngest, max_bytes=1024 * 1024, directory=directory))
+    monkeypatch.setattr(api_server, "evict_stored_resumes",
+                        functools.partial(evict_stored_resumes, directory=directory, quota_mb=0, lease_minutes=0))
+    return directory
+
+
+@pytest.fixture
+def submitted(monkeypatch):
+    """Records queued jobs instead of running the workflow."""
+    calls = []
+    monkeypatch.setattr(api_server.executor, "submit", lambda *args: calls.append(args))
+    monkeypatch.setattr(api_server, "jobs", {})
+    monkeypatch.setattr(api_server, "job_files", {})
+    return calls
+
+
+@pytest.fixture
+def client():
+    return api_server.app.test_client()
+
+
+def post_resumes(client, *files, job_url="https://jobs.example.com/genai"):
+    data = {"resume_file": [(io.BytesIO(content), name) for name, content in files]}
+    if job_url:
+        data["job_url"] = job_url
+    return client.post("/api/jobs", data=data, content_type="multipart/form-data")
+
+
+def test_oversized_part_is_a_413_and_removes_earlier_parts(client, store_dir, submitted):
+    response = post_resumes(client, ("small.pdf", b"a" * 512 * 1024), ("big.pdf", b"b" * 2 * 1024 * 1024))
+    assert response.status_code == 413
+    assert response.get_json() == {"error": "File exceeds the 1 MB limit."}
+    assert stored_files(store_dir) == []
+    assert submitted == []
+
+
+def test_rejected_request_leaves_no_temp_files(client, store_dir, submitted):
+    response = post_resumes(client, ("resume.pdf", b"%PDF resume"), job_url=None)
+    assert response.status_code == 400
+    response = post_resumes(client, ("resume.txt", b"plain text"))
+    assert response.status_code == 400
+    assert stored_files(store_dir) == []
+
+
+def test_queued_jobs_keep_their_resume_through_eviction(client, store_dir, submitted):
+    response = post_resumes(client, ("a.pdf", b"%PDF first"), ("b.pdf", b"%PDF second"))
+    assert response.status_code == 202
+    assert [job["filename"] for job in response.get_json()["jobs"]] == ["a.pdf", "b.pdf"]
+
+    # The quota is 0, so only the queued jobs' files being protected keeps them
+    queued_paths = [file_path for _, _, file_path, _ in submitted]
+    assert all(os.path.exists(path) for path in queued_paths)
+    assert sorted(api_server.job_files.values()) == sorted(queued_paths)
+    assert len(stored_files(store_dir)) == 2
+
+
+@pytest.fixture
+def workflow(monkeypatch):
+    """Stands in for the recruitment workflow; set 'error' to make it fail."""
+    state = {"error": None, "status_seen": None}
+
+    def run_recruitment_workflow(resume_file_path, job_url, stage_callback):
+        state["status_seen"] = api_server.jobs[next(iter(api_server.jobs))]["status"]
+        stage_callback("Web Scraper", 0.25)
+        if state["error"]:
+            raise RuntimeError(state["error"])
+        return "crew output"
+
+    monkeypatch.setattr(api_server, "run_recruitment_workflow", run_recruitment_workflow)
+    monkeypatch.setattr(api_server, "summarize_screening_result", lambda output: {"decision": "Proceed with interview"})
+    return state
+
+
+def run_queued(submitted):
+    for function, *args in submitted:
+        function(*args)
+
+
+def test_job_status_goes_from_queued_to_running_to_completed(client, store_dir, submitted, workflow):
+    job_id = post_resumes(client, ("a.pdf", b"%PDF first")).get_json()["jobs"][0]["job_id"]
+    assert client.get(f"/api/jobs/{job_id}").get_json()["status"] == "queued"
+
+    run_queued(submitted)
+
+    job = client.get(f"/api/jobs/{job_id}").get_json()
+    assert workflow["status_seen"] == "running"
+    assert job["status"] == "completed"
+    assert job["result"] == {"decision": "Proceed with interview"}
+    assert job["stages"] == [{"stage": "Web Scraper", "seconds": 0.25}]
+    assert api_server.job_files == {}
+
+
+def test_failed_workflow_marks_the_job_failed(client, store_dir, submitted, workflow):
+    workflow["error"] = "job page unreachable"
+    job_id = post_resumes(client, ("a.pdf", b"%PDF first")).get_json()["jobs"][0]["job_id"]
+
+    run_queued(submitted)
+
+    job = client.get(f"/api/jobs/{job_id}").get_json()
+    assert job["status"] == "failed"
+    assert job["error"] == "job page unreachable"
+    assert api_server.job_files == {}
+
+
+def test_finished_jobs_expire_after_the_ttl(client, submitted):
+    now = time.time()
+    api_server.jobs.update({
+        "old": {"status": "completed", "finished": now - 2 * 3600},
+        "recent": {"status": "failed", "finished": now - 60},
+        "running": {"status": "running"},
+    })
+
+    assert api_server.evict_finished_jobs(ttl_minutes=60) == 1
+    assert sorted(api_server.jobs) == ["recent", "running"]
+    assert client.get("/api/jobs/old").status_code == 404
+
+
+def test_event_stream_ends_when_the_job_finishes(client, store_dir, submitted, workflow):
+    job_id = post_resumes(client, ("a.pdf", b"%PDF first")).get_json()["jobs"][0]["job_id"]
+    response = client.get(f"/api/jobs/{job_id}/events", buffered=False)
+    chunks = iter(response.response)
+    first = json.loads(next(chunks).decode().removeprefix("data: "))
+    assert first["status"] == "queued"
+
+    worker = threading.Thread(target=run_queued, args=(submitted,))
+    worker.start()
+    # Reading to the end only returns once the generator stops after the final status
+    rest = [json.loads(chunk.decode().removeprefix("data: ")) for chunk in chunks]
+    worker.join()
+    assert rest[-1]["status"] == "completed"
+
+
+def test_event_stream_ends_when_the_job_is_dropped(client, submitted):
+    api_server.jobs["gone"] = {"status": "running", "updated": time.time()}
+    response = client.get("/api/jobs/gone/events", buffered=False)
+    chunks = iter(response.response)
+    assert json.loads(next(chunks).decode().removeprefix("data: "))["status"] == "running"
+
+    del api_server.jobs["gone"]
+    assert list(chunks) == []
@@ -0,0 +1,29 @@
+# tests/test_embedding_backend.py
+
+import time
+import threading
+from src.services import embedding_backend
+from src.services.embedding_backend import get_embedding_backend, load_embedding_backend
+
+
+def test_concurrent_cold_start_loads_the_model_once(monkeypatch):
+    loads = []
+
+    class SlowBackend:
+        def __init__(self, intra_op_threads):
+            loads.append(intra_op_threads)
+            time.sleep(0.2)
+
+    monkeypatch.setitem(embedding_backend.BACKENDS, "slow", SlowBackend)
+    results = []
+    workers = [threading.Thread(target=lambda: results.append(get_embedding_backend("slow", 0))) for _ in range(4)]
+    try:
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    finally:
+        load_embedding_backend.cache_clear()
+
+    assert len(loads) == 1
+    assert len({id(backend) for backend in results}) == 1
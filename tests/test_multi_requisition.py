@@ -0,0 +1,141 @@
+# tests/test_multi_requisition.py
+
+import json
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from src import resume_processor
+from src.tools import prompt_compactor
+from src.resume_processor import run_multi_requisition_screening
+
+
+def unit(x: float, y: float) -> np.ndarray:
+    vector = np.array([x, y])
+    return vector / np.linalg.norm(vector)
+
+
+# Each resume and job page is one short document with a fixed embedding, so the
+# similarity of every pair (cosine x 100) is known up front
+RESUMES = {
+    "ada.pdf": ("Ada Lovelace trains machine learning models in Python.", unit(0.96, 0.28)),
+    "grace.pdf": ("Grace Hopper builds data pipelines and compilers.", unit(0.6, 0.8)),
+    "linus.pdf": ("Linus Torvalds maintains data platform kernels.", unit(0.28, 0.96)),
+    "mallory.pdf": ("Mallory Jones sells insurance door to door.", unit(0.28, -0.96)),
+}
+JOBS = {
+    "https://jobs.example.com/ml": ("Machine learning engineer to train and ship models.", unit(1, 0)),
+    "https://jobs.example.com/data": ("Data engineer to own the data platform.", unit(0, 1)),
+    "https://jobs.example.com/sales": ("Insurance sales representative.", unit(-1, -0.2)),
+}
+# LLM Analyst score per candidate, keyed on the first name in the compacted resume
+LLM_SCORES = {"Ada": 90, "Grace": 70, "Linus": 70, "Mallory": 40}
+
+
+class FixedVectorBackend:
+    """Stand-in for the embedding model: known documents get their fixed vector, prompt sections a constant one."""
+
+    def __init__(self):
+        self.vectors = {text: vector for text, vector in list(RESUMES.values()) + list(JOBS.values())}
+        self.encoded = []
+
+    def encode(self, texts) -> np.ndarray:
+        texts = list(texts)
+        self.encoded.append(texts)
+        return np.array([self.vectors.get(text, unit(1, 1)) for text in texts])
+
+
+class ScriptedCrew:
+    """Stand-in for a crew of the LLM Analyst and Decision Maker tasks."""
+
+    def __init__(self, agents, tasks, process, verbose):
+        self.tasks = tasks
+
+    def kickoff(self):
+        name = next(name for name in LLM_SCORES if name in self.tasks[0].description)
+        score = LLM_SCORES[name]
+        analysis = json.dumps({"score": score, "summary": f"{name} reviewed."})
+        decision = "Proceed with interview" if score >= 70 else "Reject"
+        return SimpleNamespace(tasks_output=[SimpleNamespace(raw=analysis), SimpleNamespace(raw=decision)])
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    fake = FixedVectorBackend()
+    monkeypatch.setattr(resume_processor, "get_embedding_backend", lambda: fake)
+    monkeypatch.setattr(prompt_compactor, "get_embedding_backend", lambda: fake)
+    monkeypatch.setattr(resume_processor.ResumeParserTool, "_run",
+                        lambda self, path: {"text": RESUMES[path][0], "email": path.replace(".pdf", "@example.com")})
+    monkeypatch.setattr(resume_processor, "Crew", ScriptedCrew)
+    monkeypatch.setattr(resume_processor, "with_own_agents", lambda tasks: tasks)
+    return fake
+
+
+def scrape(url):
+    if url not in JOBS:
+        raise ConnectionError(f"could not fetch {url}")
+    return JOBS[url][0]
+
+
+@pytest.fixture(autouse=True)
+def job_board(monkeypatch):
+    monkeypatch.setattr(resume_processor, "scrape_job_description", scrape)
+
+
+def screen(job_urls, **kwargs):
+    return run_multi_requisition_screening(list(RESUMES), job_urls, **kwargs)
+
+
+def emails(shortlist):
+    return [entry["email"] for entry in shortlist]
+
+
+def test_every_pair_is_scored_in_one_batch_per_side(backend):
+    shortlists = screen(list(JOBS), top_k=len(RESUMES))
+
+    # One encode call for all resumes and one for all job pages, before any prompt sections
+    assert backend.encoded[0] == [text for text, _ in RESUMES.values()]
+    assert backend.encoded[1] == [text for text, _ in JOBS.values()]
+
+    for job_url, (_, job_vector) in JOBS.items():
+        for entry in shortlists[job_url]:
+            resume_vector = RESUMES[entry["file_path"]][1]
+            assert entry["similarity_score"] == pytest.approx(float(resume_vector @ job_vector) * 100, abs=0.01)
+
+
+def test_top_k_resumes_per_role_go_to_llm_verification(backend):
+    shortlists = screen(list(JOBS), top_k=2)
+
+    assert sorted(emails(shortlists["https://jobs.example.com/ml"])) == ["ada@example.com", "grace@example.com"]
+    assert sorted(emails(shortlists["https://jobs.example.com/data"])) == ["grace@example.com", "linus@example.com"]
+    assert all(len(shortlist) == 2 for shortlist in shortlists.values())
+
+
+def test_shortlist_is_ordered_by_llm_score_then_similarity(backend):
+    shortlist = screen(["https://jobs.example.com/ml"], top_k=4)["https://jobs.example.com/ml"]
+
+    # Grace and Linus tie on the LLM score, so the closer embedding match comes first
+    assert emails(shortlist) == ["ada@example.com", "grace@example.com", "linus@example.com", "mallory@example.com"]
+    assert [entry["decision"] for entry in shortlist] == ["Proceed with interview"] * 3 + ["Reject"]
+
+
+def test_similarity_floor_drops_weak_matches(backend):
+    shortlist = screen(["https://jobs.example.com/ml"], top_k=4, min_similarity=50)["https://jobs.example.com/ml"]
+
+    assert sorted(emails(shortlist)) == ["ada@example.com", "grace@example.com"]
+
+
+def test_zero_floor_keeps_negative_similarities(backend):
+    shortlist = screen(["https://jobs.example.com/sales"], top_k=2, min_similarity=0)["https://jobs.example.com/sales"]
+
+    # Every resume points away from the sales role; the best two are still shortlisted
+    assert all(entry["similarity_score"] < 0 for entry in shortlist)
+    assert sorted(emails(shortlist)) == ["linus@example.com", "mallory@example.com"]
+
+
+def test_failed_scrape_gets_an_empty_shortlist_and_other_roles_still_run(backend):
+    shortlists = screen(["https://jobs.example.com/gone", "https://jobs.example.com/data"], top_k=1)
+
+    assert shortlists["https://jobs.example.com/gone"] == []
+    assert emails(shortlists["https://jobs.example.com/data"]) == ["linus@example.com"]
+    # The unreachable page is never embedded
+    assert backend.encoded[1] == [JOBS["https://jobs.example.com/data"][0]]
@@ -0,0 +1,138 @@
+# tests/test_profiler.py
+
+import os
+import re
+import json
+import time
+import threading
+import tracemalloc
+from collections import Counter
+import pytest
+from src.services import profiler
+from src.services.profiler import SamplingProfiler, profile_run, profiled
+
+OUTER = ("run_workflow", "/app/src/resume_processor.py", 10)
+INNER = ("encode;batch", "/app/src/services/embedding_backend.py", 42)
+OTHER = ("kickoff", "/app/crewai/crew.py", 7)
+
+
+def busy(seconds: float = 0.05):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+def written(directory, suffix: str) -> list:
+    if not os.path.isdir(directory):
+        return []
+    return sorted(filename for filename in os.listdir(directory) if filename.endswith(suffix))
+
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    directory = str(tmp_path / "profiles")
+    monkeypatch.setattr(profiler, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(profiler, "PROFILE_OUTPUT_DIR", directory)
+    return directory
+
+
+@pytest.fixture
+def sampled():
+    sampler = SamplingProfiler()
+    sampler.seconds = Counter({(OUTER, INNER): 0.0304, (OUTER, OTHER): 0.0101, (OUTER,): 0.0002})
+    return sampler
+
+
+def test_collapsed_output_is_one_weighted_stack_per_line(sampled, tmp_path):
+    path = str(tmp_path / "run.collapsed.txt")
+    sampled.write_collapsed(path)
+    with open(path) as f:
+        lines = f.read().splitlines()
+
+    assert lines == [
+        "run_workflow (resume_processor.py:10);encode,batch (embedding_backend.py:42) 30",
+        "run_workflow (resume_processor.py:10);kickoff (crew.py:7) 10",
+        # Weights are rounded to ms, but a sampled stack never drops to 0
+        "run_workflow (resume_processor.py:10) 1",
+    ]
+    assert all(re.fullmatch(r"[^;]+(;[^;]+)* \d+", line) for line in lines)
+
+
+def test_speedscope_output_is_a_sampled_profile(sampled, tmp_path):
+    path = str(tmp_path / "run.speedscope.json")
+    sampled.write_speedscope(path, "run")
+    with open(path) as f:
+        document = json.load(f)
+
+    assert document["$schema"] == "https://www.speedscope.app/file-format-schema.json"
+    frames = document["shared"]["frames"]
+    assert [frame["name"] for frame in frames] == ["run_workflow", "encode;batch", "kickoff"]
+    (profile,) = document["profiles"]
+    assert profile["type"] == "sampled"
+    assert profile["unit"] == "milliseconds"
+    assert len(profile["samples"]) == len(profile["weights"]) == 3
+    assert all(0 <= index < len(frames) for sample in profile["samples"] for index in sample)
+    assert profile["endValue"] == pytest.approx(sum(profile["weights"]))
+
+
+def test_profiled_run_writes_all_three_reports(output_dir):
+    with profile_run("screening", enabled=True):
+        busy()
+
+    assert len(written(output_dir, ".collapsed.txt")) == 1
+    assert len(written(output_dir, ".speedscope.json")) == 1
+    assert len(written(output_dir, ".allocations.txt")) == 1
+    assert not tracemalloc.is_tracing()
+
+
+def test_nested_profiled_calls_reuse_the_outer_profile(output_dir):
+    @profiled("inner")
+    def inner():
+        busy()
+
+    @profiled("outer")
+    def outer():
+        inner()
+        inner(profile=True)
+
+    outer()
+
+    (collapsed,) = written(output_dir, ".collapsed.txt")
+    assert "-outer-" in collapsed
+    with open(os.path.join(output_dir, collapsed)) as f:
+        assert "inner (test_profiler.py" in f.read()
+
+
+def test_profile_false_overrides_the_setting(output_dir):
+    @profiled("screening")
+    def screening():
+        busy()
+
+    screening(profile=False)
+    assert written(output_dir, "") == []
+
+
+def test_concurrent_runs_trace_allocations_one_at_a_time(output_dir):
+    both_running = threading.Barrier(2)
+
+    def run():
+        with profile_run("screening", enabled=True):
+            both_running.wait(timeout=5)
+            busy()
+
+    workers = [threading.Thread(target=run) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    # Both runs are sampled, but only the one holding tracemalloc reports allocations
+    assert len(written(output_dir, ".collapsed.txt")) == 2
+    assert len(written(output_dir, ".allocations.txt")) == 1
+    assert not profiler.tracemalloc_lock.locked()
+    assert not tracemalloc.is_tracing()
+
+    # The lock was released, so the next run traces again
+    with profile_run("after", enabled=True):
+        busy()
+    assert len(written(output_dir, ".allocations.txt")) == 2
@@ -0,0 +1,163 @@
+# tests/test_prompt_compactor.py
+
+import re
+import sys
+import zlib
+import numpy as np
+import pytest
+from src.tools import prompt_compactor
+from src.tools.prompt_compactor import (
+    build_compact_prompt_context,
+    compact_prepared_documents,
+    count_tokens,
+    prepare_document,
+    split_into_sections
+)
+
+
+class BagOfWordsBackend:
+    """Deterministic stand-in for the sentence embedding model: hashed word counts."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts) -> np.ndarray:
+        texts = list(texts)
+        self.encoded.append(texts)
+        embeddings = np.zeros((len(texts), 256))
+        for row, text in enumerate(texts):
+            for word in re.findall(r"[a-z]+", text.lower()):
+                embeddings[row, zlib.crc32(word.encode()) % 256] += 1
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.where(norms == 0, 1, norms)
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    fake = BagOfWordsBackend()
+    monkeypatch.setattr(prompt_compactor, "get_embedding_backend", lambda: fake)
+    return fake
+
+
+RESUME = """Priya Sharma
+Built the login service and SSO sign in flow for 2M users.
+Implemented cookie-based session handling across web and mobile.
+Designed subscription billing; users can subscribe and upgrade plans.
+"""
+
+JOB_PAGE = (
+    "Skip to main content. We use cookies to improve your experience. "
+    "We are hiring a backend engineer to own authentication and billing services. "
+    "Sign in to apply. © 2025 Acme Corp. All rights reserved."
+)
+
+
+def test_resume_lines_are_never_treated_as_boilerplate():
+    sections = split_into_sections(RESUME, max_words=12)
+    text = " ".join(sections)
+    assert "SSO sign in flow" in text
+    assert "cookie-based session handling" in text
+    assert "users can subscribe" in text
+
+
+def test_job_page_boilerplate_is_dropped():
+    text = " ".join(split_into_sections(JOB_PAGE, drop_boilerplate=True))
+    assert "backend engineer" in text
+    assert "cookies" not in text
+    assert "Sign in to apply" not in text
+    assert "All rights reserved" not in text
+
+
+def test_duplicate_lines_are_dropped_and_long_lines_chunked():
+    text = "Python and SQL\npython and sql\n" + " ".join(["word"] * 25)
+    sections = split_into_sections(text, max_words=10)
+    assert sections[0] == "Python and SQL"
+    assert all(len(section.split()) <= 10 for section in sections)
+    assert sum(len(section.split()) for section in sections) == 3 + 25
+
+
+def test_compact_context_keeps_resume_experience_and_fits_budget(backend):
+    context = build_compact_prompt_context(RESUME, JOB_PAGE, token_budget=200)
+    assert "sign in flow" in context["resume"]
+    assert "cookie-based session handling" in context["resume"]
+    assert "cookies" not in context["job_description"]
+    assert context["tokens"] <= 200
+    assert context["tokens"] == count_tokens(context["resume"]) + count_tokens(context["job_description"])
+
+
+def test_compact_context_prefers_relevant_sections(backend):
+    # Lines of 50 words, so each one becomes its own section
+    relevant = " ".join(["wrote Go services on Kubernetes"] * 10)
+    unrelated = " ".join(["baked sourdough bread on weekends"] * 10)
+    resume = f"{unrelated}\n{relevant}"
+    job = "Backend engineer for Go services running on Kubernetes."
+    context = build_compact_prompt_context(resume, job, token_budget=count_tokens(job) + count_tokens(relevant))
+    assert "Kubernetes" in context["resume"]
+    assert "sourdough" not in context["resume"]
+
+
+def test_compact_context_without_job_description_keeps_leading_resume(backend):
+    context = build_compact_prompt_context(RESUME, "", token_budget=1000)
+    assert context["job_description"] == ""
+    assert context["resume"].startswith("Priya Sharma")
+    assert backend.encoded == []
+
+
+def test_prepared_documents_match_one_off_compaction(backend):
+    resume = prepare_document(RESUME)
+    job = prepare_document(JOB_PAGE, drop_boilerplate=True)
+    assert compact_prepared_documents(resume, job, 200) == build_compact_prompt_context(RESUME, JOB_PAGE, 200)
+
+
+def test_prepared_documents_are_not_re_encoded(backend):
+    resume = prepare_document(RESUME)
+    jobs = [prepare_document(JOB_PAGE, drop_boilerplate=True), prepare_document("Billing engineer, Python.")]
+    encoded_before = len(backend.encoded)
+    for job in jobs:
+        compact_prepared_documents(resume, job, 200)
+    assert len(backend.encoded) == encoded_before == 3
+
+
+def test_newline_separators_are_charged_against_the_budget(backend, monkeypatch):
+    # Like tiktoken, count every newline as a token of its own
+    monkeypatch.setattr(prompt_compactor, "count_tokens", lambda text: len(text.split()) + text.count("\n"))
+    # 50-word lines, so each one is a section of its own
+    resume = "\n".join(f"skill{i} " + "python kubernetes " * 24 + "services" for i in range(12))
+    job = "\n".join(f"requirement{i} " + "python kubernetes " * 24 + "go" for i in range(12))
+    for budget in (150, 203, 407):
+        context = build_compact_prompt_context(resume, job, token_budget=budget)
+        assert context["tokens"] <= budget
+        assert prompt_compactor.count_tokens(context["resume"]) + prompt_compactor.count_tokens(context["job_description"]) <= budget
+        only_resume = build_compact_prompt_context(resume, "", token_budget=budget)
+        assert only_resume["tokens"] <= budget
+
+
+class FlakyTiktoken:
+    """Fails to load its encoding the first time, as tiktoken does when the BPE download errors."""
+
+    def __init__(self):
+        self.attempts = 0
+
+    def get_encoding(self, name):
+        self.attempts += 1
+        if self.attempts == 1:
+            raise ConnectionError("network unreachable")
+        return f"encoder:{name}"
+
+
+def test_failed_tokenizer_load_is_retried_not_cached(monkeypatch):
+    tiktoken = FlakyTiktoken()
+    monkeypatch.setitem(sys.modules, "tiktoken", tiktoken)
+    monkeypatch.setattr(prompt_compactor, "tokenizer_state", {"encoder": None, "failed_at": None})
+    monkeypatch.setattr(prompt_compactor, "PROMPT_TOKENIZER_RETRY_SECONDS", 3600)
+
+    assert prompt_compactor.get_tokenizer() is None
+    assert prompt_compactor.tokenizer_name() == "approximate"
+    # Within the retry interval the fallback is used without hitting the network again
+    assert tiktoken.attempts == 1
+
+    monkeypatch.setattr(prompt_compactor, "PROMPT_TOKENIZER_RETRY_SECONDS", 0)
+    assert prompt_compactor.get_tokenizer() == "encoder:cl100k_base"
+    assert prompt_compactor.get_tokenizer() == "encoder:cl100k_base"
+    assert tiktoken.attempts == 2
+    assert prompt_compactor.tokenizer_name() == "cl100k_base"
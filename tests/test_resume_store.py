@@ -0,0 +1,122 @@
+# tests/test_resume_store.py
+
+import io
+import os
+import time
+import hashlib
+import pytest
+from werkzeug.exceptions import HTTPException
+from src.services.resume_store import (
+    StreamingIngest,
+    UploadTooLargeError,
+    evict_stored_resumes,
+    ingest_stream,
+    lease_stored_resume
+)
+
+
+def stored_files(directory):
+    return sorted(
+        os.path.relpath(os.path.join(root, filename), directory)
+        for root, _, filenames in os.walk(directory)
+        for filename in filenames
+    )
+
+
+def store_file(directory, data: bytes, age_hours: float = 0, name: str = "resume.pdf") -> str:
+    path = ingest_stream(io.BytesIO(data), name, max_bytes=len(data) + 1, directory=directory)["file_path"]
+    mtime = time.time() - age_hours * 3600
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def store_dir(tmp_path):
+    return str(tmp_path / "resumes")
+
+
+def test_ingest_is_content_addressed(store_dir):
+    data = b"%PDF-1.4 resume" * 100
+    upload = ingest_stream(io.BytesIO(data), "Resume.PDF", directory=store_dir)
+    sha256 = hashlib.sha256(data).hexdigest()
+    assert upload["sha256"] == sha256
+    assert upload["size"] == len(data)
+    assert upload["file_path"] == os.path.join(store_dir, sha256[:2], f"{sha256}.pdf")
+    with open(upload["file_path"], "rb") as f:
+        assert f.read() == data
+    assert stored_files(store_dir) == [os.path.join(sha256[:2], f"{sha256}.pdf")]
+
+
+def test_duplicate_upload_reuses_the_stored_file(store_dir):
+    first = store_file(store_dir, b"same resume", age_hours=5)
+    second = ingest_stream(io.BytesIO(b"same resume"), "copy.pdf", directory=store_dir)
+    assert second["duplicate"] is True
+    assert second["file_path"] == first
+    assert time.time() - os.stat(first).st_mtime < 60
+    assert len(stored_files(store_dir)) == 1
+
+
+def test_oversized_upload_is_an_http_413_and_leaves_nothing_behind(store_dir):
+    with pytest.raises(UploadTooLargeError) as raised:
+        ingest_stream(io.BytesIO(b"x" * 2048), "big.pdf", max_bytes=1024, directory=store_dir)
+    # Not a ValueError, which werkzeug's form parser would swallow
+    assert isinstance(raised.value, HTTPException)
+    assert not isinstance(raised.value, ValueError)
+    assert raised.value.code == 413
+    assert stored_files(store_dir) == []
+
+
+def test_eviction_removes_old_files_then_oldest_over_quota(store_dir):
+    expired = store_file(store_dir, b"a" * 1024, age_hours=100)
+    oldest = store_file(store_dir, b"b" * 600 * 1024, age_hours=3)
+    newest = store_file(store_dir, b"c" * 600 * 1024, age_hours=1)
+    assert evict_stored_resumes(max_age_hours=72, quota_mb=1, directory=store_dir) == 2
+    assert not os.path.exists(expired)
+    assert not os.path.exists(oldest)
+    assert os.path.exists(newest)
+
+
+def test_eviction_skips_protected_files(store_dir):
+    expired = store_file(store_dir, b"a" * 1024, age_hours=100)
+    oldest = store_file(store_dir, b"b" * 600 * 1024, age_hours=3)
+    newest = store_file(store_dir, b"c" * 600 * 1024, age_hours=1)
+    removed = evict_stored_resumes(max_age_hours=72, quota_mb=1, directory=store_dir,
+                                   protected_paths=[expired, os.path.relpath(oldest)])
+    assert removed == 1
+    assert os.path.exists(expired)
+    assert os.path.exists(oldest)
+    assert not os.path.exists(newest)
+
+
+def test_uploads_in_progress_only_expire_by_age(store_dir):
+    in_progress = StreamingIngest(max_bytes=4 * 1024 * 1024, directory=store_dir)
+    in_progress.write(b"x" * 2 * 1024 * 1024)
+    in_progress.flush()
+    assert evict_stored_resumes(max_age_hours=72, quota_mb=1, directory=store_dir) == 0
+    assert os.path.exists(in_progress.name)
+
+    stale = time.time() - 100 * 3600
+    os.utime(in_progress.name, (stale, stale))
+    assert evict_stored_resumes(max_age_hours=72, quota_mb=1, directory=store_dir) == 1
+
+
+def test_files_leased_by_another_process_survive_quota_eviction(store_dir):
+    oldest = store_file(store_dir, b"b" * 600 * 1024, age_hours=3)
+    newest = store_file(store_dir, b"c" * 600 * 1024, age_hours=1)
+    # Another process starts screening the oldest resume; this one knows nothing about it
+    assert lease_stored_resume(oldest, directory=store_dir)
+    assert evict_stored_resumes(max_age_hours=72, quota_mb=1, directory=store_dir, lease_minutes=30) == 1
+    assert os.path.exists(oldest)
+    assert not os.path.exists(newest)
+
+
+def test_leases_expire_and_only_apply_inside_the_store(store_dir, tmp_path):
+    leased = store_file(store_dir, b"a" * 1024, age_hours=1)
+    assert evict_stored_resumes(max_age_hours=72, quota_mb=0, directory=store_dir, lease_minutes=30) == 1
+    assert not os.path.exists(leased)
+
+    outside = tmp_path / "sample.pdf"
+    outside.write_bytes(b"%PDF sample")
+    os.utime(outside, (0, 0))
+    assert not lease_stored_resume(str(outside), directory=store_dir)
+    assert os.stat(outside).st_mtime == 0
@@ -0,0 +1,137 @@
+# tests/test_stage_executor.py
+
+import os
+import json
+import time
+import pytest
+from src.stage_executor import CheckpointStore, Stage, StageExecutor
+
+
+def counting_stage(name, calls, result=None, depends_on=None, inputs=None, succeeded=None):
+    """A stage that records each time it runs and returns `result` (its name by default)."""
+    def run(upstream):
+        calls.append(name)
+        return result if result is not None else {"raw": name, "upstream": upstream}
+    return Stage(name, run, depends_on, inputs, succeeded)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CheckpointStore(str(tmp_path / "checkpoints"))
+
+
+def test_completed_stages_are_restored(store):
+    calls = []
+    stages = [counting_stage("scrape", calls), counting_stage("match", calls, depends_on=["scrape"])]
+    first = StageExecutor(store).run(stages)
+    second = StageExecutor(store).run(stages)
+    assert calls == ["scrape", "match"]
+    assert second == first
+    assert store.stats == {"hits": 2, "misses": 2}
+
+
+def test_failed_stage_and_its_dependents_are_not_checkpointed(store):
+    calls = []
+    stages = [
+        counting_stage("scrape", calls, {"raw": "Error scraping URL: timeout"},
+                       succeeded=lambda output: "Error" not in output["raw"]),
+        counting_stage("match", calls, depends_on=["scrape"]),
+    ]
+    outputs = StageExecutor(store).run(stages)
+    assert outputs["scrape"]["raw"].startswith("Error")
+    assert not os.path.exists(store.directory)
+
+    StageExecutor(store).run(stages)
+    assert calls == ["scrape", "match", "scrape", "match"]
+
+
+def test_retry_only_reruns_the_failed_stage(store):
+    calls = []
+    attempts = iter(["Error creating Google Meet event", "Interview scheduled"])
+
+    def schedule(upstream):
+        calls.append("schedule")
+        return {"raw": next(attempts)}
+
+    stages = [
+        counting_stage("decide", calls),
+        Stage("schedule", schedule, ["decide"], succeeded=lambda output: "Error" not in output["raw"]),
+    ]
+    StageExecutor(store).run(stages)
+    outputs = StageExecutor(store).run(stages)
+    assert calls == ["decide", "schedule", "schedule"]
+    assert outputs["schedule"]["raw"] == "Interview scheduled"
+
+
+def test_changed_inputs_invalidate_downstream_stages(store):
+    calls = []
+
+    def stages(job_description):
+        return [
+            counting_stage("scrape", calls, inputs={"job_description": job_description}),
+            counting_stage("analyse", calls, depends_on=["scrape"], inputs={"model": "gpt-4o-mini"}),
+        ]
+
+    StageExecutor(store).run(stages("v1"))
+    StageExecutor(store).run(stages("v1"))
+    StageExecutor(store).run(stages("v2"))
+    assert calls == ["scrape", "analyse", "scrape", "analyse"]
+
+
+def test_only_reruns_one_stage_and_skips_downstream(store):
+    calls = []
+    stages = [
+        counting_stage("scrape", calls),
+        counting_stage("decide", calls, depends_on=["scrape"]),
+        counting_stage("schedule", calls, depends_on=["decide"]),
+    ]
+    StageExecutor(store).run(stages)
+    outputs = StageExecutor(store).run(stages, only="decide")
+    assert calls == ["scrape", "decide", "schedule", "decide"]
+    assert set(outputs) == {"scrape", "decide"}
+
+
+def test_force_reruns_everything(store):
+    calls = []
+    stages = [counting_stage("scrape", calls)]
+    StageExecutor(store).run(stages)
+    StageExecutor(store).run(stages, force=True)
+    assert calls == ["scrape", "scrape"]
+
+
+def test_invalid_stage_lists_are_rejected(store):
+    with pytest.raises(ValueError, match="Unknown stage"):
+        StageExecutor(store).run([counting_stage("scrape", [])], only="schedule")
+    with pytest.raises(ValueError, match="must be listed before"):
+        StageExecutor(store).run([counting_stage("match", [], depends_on=["scrape"]), counting_stage("scrape", [])])
+
+
+def test_stage_callback_reports_executed_stages_only(store):
+    reported = []
+    stages = [counting_stage("scrape", [])]
+    StageExecutor(store, stage_callback=lambda name, seconds: reported.append(name)).run(stages)
+    StageExecutor(store, stage_callback=lambda name, seconds: reported.append(name)).run(stages)
+    assert reported == ["scrape"]
+
+
+def test_expired_checkpoints_are_missed_and_evicted(tmp_path):
+    store = CheckpointStore(str(tmp_path), ttl_hours=1)
+    store.save("fresh", "scrape", "new")
+    two_hours_ago = time.time() - 2 * 3600
+    with open(store.path_for("stale"), "w") as f:
+        json.dump({"stage": "scrape", "created": two_hours_ago, "output": "old"}, f)
+    os.utime(store.path_for("stale"), (two_hours_ago, two_hours_ago))
+
+    assert store.load("stale") == (False, None)
+    assert store.load("fresh") == (True, "new")
+    assert store.evict() == 1
+    assert os.listdir(tmp_path) == ["fresh.json"]
+
+
+def test_disabled_store_writes_nothing(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints"), enabled=False)
+    calls = []
+    StageExecutor(store).run([counting_stage("scrape", calls)])
+    StageExecutor(store).run([counting_stage("scrape", calls)])
+    assert calls == ["scrape", "scrape"]
+    assert not os.path.exists(store.directory)
@@ -0,0 +1,22 @@
+# tests/test_stub_servers.py
+
+from benchmarks.stub_servers import request_key
+
+
+def chat(content: str) -> dict:
+    return {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": content}]}
+
+
+def test_request_key_ignores_ports_and_checkout_location():
+    prompt = "Parse the resume at '{}/resumes/ada.pdf' and call http://127.0.0.1:{}/v1"
+    here = request_key(chat(prompt.format("/home/ci/repo/benchmarks/output", 40123)),
+                       {"/home/ci/repo/benchmarks/output": "<benchmark-output>"})
+    there = request_key(chat(prompt.format("/Users/dev/HiringAgent/benchmarks/output", 51877)),
+                        {"/Users/dev/HiringAgent/benchmarks/output": "<benchmark-output>"})
+    assert here == there
+
+
+def test_request_key_still_tells_different_files_apart():
+    masked = {"/srv/benchmarks/output": "<benchmark-output>"}
+    assert request_key(chat("/srv/benchmarks/output/resumes/ada.pdf"), masked) != \
+        request_key(chat("/srv/benchmarks/output/resumes/grace.pdf"), masked)